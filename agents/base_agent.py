@@ -5,6 +5,7 @@ from openai import OpenAI
 from database.vector_db import VectorDatabaseManager
 from database.graph_db import GraphDatabaseManager
 from config import AGENT_CONFIGS, OPENAI_API_KEY
+from utils.text_utils import preview_text
 
 class BaseAgent(ABC):
     def __init__(self, agent_name: str):
@@ -61,11 +62,13 @@ class BaseAgent(ABC):
         return response.choices[0].message.content
         
     def process_query_with_sources(self, query: str, context: str = "", 
-                                 response_type: str = "general") -> Dict[str, Any]:
+                                 response_type: str = "general",
+                                 search_results: Optional[List[Dict]] = None) -> Dict[str, Any]:
         """Process a query and return results with detailed source information and document citations"""
         
-        # Search knowledge base
-        search_results = self.search_knowledge_base(query, top_k=8)
+        # Search knowledge base unless the caller already retrieved results
+        if search_results is None:
+            search_results = self.search_knowledge_base(query, top_k=8)
         
         # Extract context from search results
         context_parts = []
@@ -74,6 +77,7 @@ class BaseAgent(ABC):
         
         for i, result in enumerate(search_results, 1):
             metadata = result.get('metadata', {})
+            content = metadata.get('content', '')
             
             # Add to context
             if 'content' in metadata:
@@ -84,7 +88,8 @@ class BaseAgent(ABC):
                 'title': metadata.get('title', 'Unknown Document'),
                 'score': result.get('score', 0),
                 'agent': self.agent_name,
-                'content': metadata.get('content', '')[:500] + '...' if metadata.get('content') else '',
+                'content': content[:500] + '...' if content else '',
+                'content_preview': self._preview(content, 300),
                 'document_id': f"DOC_{i:03d}",
                 'metadata': {
                     'file_path': metadata.get('file_path', ''),
@@ -130,6 +135,9 @@ class BaseAgent(ABC):
             'total_documents': len(sources)
         }
     
+    # Shared with the audit logger's finding previews
+    _preview = staticmethod(preview_text)
+    
     def _extract_filename(self, file_path: str) -> str:
         """Extract filename from file path"""
         if not file_path:
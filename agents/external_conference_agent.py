@@ -241,7 +241,7 @@ Always provide specific conference details, dates, and company information when
                 "file_path": metadata.get('file_path', ''),
                 "date": metadata.get('date', 'N/A'),
                 "score": result['score'],
-                "content_preview": metadata.get('content', '')[:100] + "..."
+                "content_preview": self._preview(metadata.get('content', ''), 100)
             })
         return sources
 
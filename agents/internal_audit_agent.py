@@ -165,7 +165,7 @@ Always provide structured, actionable audit guidance with clear procedures and c
                 "title": metadata.get('title', 'Unknown'),
                 "file_path": metadata.get('file_path', ''),
                 "score": result['score'],
-                "content_preview": metadata.get('content', '')[:100] + "..."
+                "content_preview": self._preview(metadata.get('content', ''), 100)
             })
         return sources
 
@@ -251,7 +251,7 @@ Always provide specific SNC entry details, company information, and temporal con
                 "title": metadata.get('title', 'Unknown'),
                 "file_path": metadata.get('file_path', ''),
                 "score": result['score'],
-                "content_preview": metadata.get('content', '')[:100] + "..."
+                "content_preview": self._preview(metadata.get('content', ''), 100)
             })
         return sources
 
@@ -1,6 +1,7 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Union
 from datetime import datetime, timedelta
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from .base_agent import BaseAgent
 from .web_scraper_agent import WebScraperAgent
 from .internal_audit_agent import InternalAuditAgent
@@ -68,6 +69,30 @@ Always maintain professional audit standards, use evidence-based findings, and p
     def process_query(self, query: str, context: str = "", intent: str = None) -> Dict[str, Any]:
         """Process audit-related queries with intelligent routing, agent communication, and comprehensive synthesis"""
         
+        result = self._collect_agent_data(query, context, intent)
+        
+        # Generate comprehensive response based on intent with all collected data
+        result["response"] = self._generate_audit_response(
+            query, result["intent"], result["agent_data"], result["cross_agent_insights"]
+        )
+        return result
+
+    def process_query_stream(self, query: str, context: str = "", intent: str = None) -> Tuple[Dict[str, Any], Iterator[str]]:
+        """Process a query like process_query, but stream the synthesized response.
+        
+        Agent retrieval and cross-agent analysis complete before this returns. The
+        result dict carries everything except 'response', which the caller builds
+        by consuming the returned iterator of text chunks.
+        """
+        result = self._collect_agent_data(query, context, intent)
+        response_stream = self._generate_audit_response(
+            query, result["intent"], result["agent_data"], result["cross_agent_insights"], stream=True
+        )
+        return result, response_stream
+
+    def _collect_agent_data(self, query: str, context: str = "", intent: str = None) -> Dict[str, Any]:
+        """Route the query to the required agents and gather their data, citations and cross-agent insights"""
+        
         # Determine user intent and required agents
         intent = intent or self._determine_audit_intent(query)
         required_agents = self._determine_required_agents(query, intent)
@@ -78,54 +103,64 @@ Always maintain professional audit standards, use evidence-based findings, and p
         all_document_citations = []
         agent_communications = []
         
-        # First pass: Collect initial data from all agents
-        for agent_name in required_agents:
-            if agent_name in self.agents:
-                try:
-                    # Use enhanced source processing
-                    agent_response = self.agents[agent_name].process_query_with_sources(query, context)
-                    agent_data[agent_name] = agent_response
-                    
-                    # Collect sources and document citations
-                    if 'sources' in agent_response:
-                        for source in agent_response['sources']:
-                            source['agent'] = agent_name
-                            all_sources.append(source)
-                    
-                    if 'document_citations' in agent_response:
-                        for citation in agent_response['document_citations']:
-                            citation['agent'] = agent_name
-                            all_document_citations.append(citation)
-                    
-                    # Record agent communication
-                    agent_communications.append({
-                        'agent': agent_name,
-                        'status': 'completed',
-                        'documents_found': len(agent_response.get('sources', [])),
-                        'relevance_score': sum(s.get('score', 0) for s in agent_response.get('sources', []))
-                    })
-                    
-                except Exception as e:
-                    agent_data[agent_name] = {"error": str(e)}
-                    agent_communications.append({
-                        'agent': agent_name,
-                        'status': 'error',
-                        'error': str(e)
-                    })
+        # Retrieve documents for every agent in one batch: the query is embedded
+        # once and reused across all agent indexes
+        search_agents = [agent_name for agent_name in required_agents if agent_name in self.agents]
+        try:
+            batch_results = self.vector_db.batch_search(
+                [{"agent_name": agent_name, "query": query} for agent_name in search_agents],
+                top_k=8
+            )
+            prefetched_results = dict(zip(search_agents, batch_results))
+        except Exception:
+            # Fall back to per-agent searches
+            prefetched_results = {}
+        
+        # First pass: Collect initial data from all agents in parallel; each
+        # agent call is dominated by network I/O (vector search and LLM)
+        agent_outcomes = self._run_agents_parallel(search_agents, query, context, prefetched_results)
+        
+        for agent_name in search_agents:
+            agent_response = agent_outcomes[agent_name]
+            if isinstance(agent_response, Exception):
+                agent_data[agent_name] = {"error": str(agent_response)}
+                agent_communications.append({
+                    'agent': agent_name,
+                    'status': 'error',
+                    'error': str(agent_response)
+                })
+                continue
+            
+            agent_data[agent_name] = agent_response
+            
+            # Collect sources and document citations
+            if 'sources' in agent_response:
+                for source in agent_response['sources']:
+                    source['agent'] = agent_name
+                    all_sources.append(source)
+            
+            if 'document_citations' in agent_response:
+                for citation in agent_response['document_citations']:
+                    citation['agent'] = agent_name
+                    all_document_citations.append(citation)
+            
+            # Record agent communication
+            agent_communications.append({
+                'agent': agent_name,
+                'status': 'completed',
+                'documents_found': len(agent_response.get('sources', [])),
+                'relevance_score': sum(s.get('score', 0) for s in agent_response.get('sources', []))
+            })
         
         # Second pass: Agent cross-communication for enhanced insights
         cross_agent_insights = self._facilitate_agent_communication(agent_data, query, intent)
         
-        # Generate comprehensive response based on intent with all collected data
-        response = self._generate_audit_response(query, intent, agent_data, cross_agent_insights)
-        
         # Compile comprehensive document citation summary
         document_summary = self._compile_document_summary(all_document_citations)
         
         return {
             "query": query,
             "intent": intent,
-            "response": response,
             "involved_agents": required_agents,
             "agent_data": agent_data,
             "agent_communications": agent_communications,
@@ -136,6 +171,62 @@ Always maintain professional audit standards, use evidence-based findings, and p
             "timestamp": datetime.now().isoformat()
         }
 
+    def _run_agents_parallel(self, agent_names: List[str], query: str, context: str,
+                             prefetched_results: Dict[str, List[Dict]]) -> Dict[str, Any]:
+        """Query agents concurrently, mapping each agent to its response or the exception it raised"""
+        if not agent_names:
+            return {}
+        
+        timeout = self.config.get("agent_timeout", 60)
+        max_workers = min(self.config.get("max_workers", 4), len(agent_names))
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = {
+            executor.submit(
+                self.agents[agent_name].process_query_with_sources,
+                query, context, search_results=prefetched_results.get(agent_name)
+            ): agent_name
+            for agent_name in agent_names
+        }
+        
+        outcomes = {}
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                try:
+                    outcomes[futures[future]] = future.result()
+                except Exception as e:
+                    outcomes[futures[future]] = e
+        except FuturesTimeoutError:
+            for agent_name in agent_names:
+                if agent_name not in outcomes:
+                    outcomes[agent_name] = TimeoutError(f"Agent did not respond within {timeout} seconds")
+        finally:
+            # Do not block on agents that timed out; cancel the ones that never
+            # started (shutdown's cancel_futures needs Python 3.9)
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+        
+        return outcomes
+
+    def _complete(self, messages: List[Dict[str, str]], temperature: float, max_tokens: int,
+                  stream: bool = False) -> Union[str, Iterator[str]]:
+        """Run a chat completion, returning the text or, with stream=True, an iterator of text chunks"""
+        response = self.openai_client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=stream
+        )
+        
+        if not stream:
+            return response.choices[0].message.content
+        return (
+            chunk.choices[0].delta.content
+            for chunk in response
+            if chunk.choices and chunk.choices[0].delta.content
+        )
+
     def _determine_audit_intent(self, query: str) -> str:
         """Determine the specific audit intent from the query using advanced pattern recognition"""
         query_lower = query.lower()
@@ -289,33 +380,36 @@ Always maintain professional audit standards, use evidence-based findings, and p
         # Remove duplicates and return
         return list(set(required_agents))
 
-    def _generate_audit_response(self, query: str, intent: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None) -> str:
-        """Generate comprehensive audit response based on intent with cross-agent insights"""
+    def _generate_audit_response(self, query: str, intent: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None, stream: bool = False) -> Union[str, Iterator[str]]:
+        """Generate comprehensive audit response based on intent with cross-agent insights.
+        
+        With stream=True the response is returned as an iterator of text chunks.
+        """
         
         if intent == 'audit_checklist':
-            return self._generate_audit_checklist(query, agent_data, cross_agent_insights)
+            return self._generate_audit_checklist(query, agent_data, cross_agent_insights, stream=stream)
         elif intent == 'audit_agenda':
-            return self._generate_agenda_analysis(query, agent_data, cross_agent_insights)
+            return self._generate_agenda_analysis(query, agent_data, cross_agent_insights, stream=stream)
         elif intent == 'audit_report':
-            return self._generate_audit_report(query, agent_data, cross_agent_insights)
+            return self._generate_audit_report(query, agent_data, cross_agent_insights, stream=stream)
         elif intent == 'delta_analysis':
-            return self._generate_delta_analysis(query, agent_data, cross_agent_insights)
+            return self._generate_delta_analysis(query, agent_data, cross_agent_insights, stream=stream)
         elif intent == 'health_assessment':
-            return self._generate_health_assessment(query, agent_data, cross_agent_insights)
+            return self._generate_health_assessment(query, agent_data, cross_agent_insights, stream=stream)
         elif intent == 'trend_analysis':
-            return self._generate_trend_analysis(query, agent_data, cross_agent_insights)
+            return self._generate_trend_analysis(query, agent_data, cross_agent_insights, stream=stream)
         elif intent == 'quality_analysis':
-            return self._generate_quality_analysis(query, agent_data, cross_agent_insights)
+            return self._generate_quality_analysis(query, agent_data, cross_agent_insights, stream=stream)
         elif intent == 'sop_review':
-            return self._generate_sop_review(query, agent_data, cross_agent_insights)
+            return self._generate_sop_review(query, agent_data, cross_agent_insights, stream=stream)
         elif intent == 'regulatory_research':
-            return self._generate_regulatory_research(query, agent_data, cross_agent_insights)
+            return self._generate_regulatory_research(query, agent_data, cross_agent_insights, stream=stream)
         elif intent == 'conference_analysis':
-            return self._generate_conference_analysis(query, agent_data, cross_agent_insights)
+            return self._generate_conference_analysis(query, agent_data, cross_agent_insights, stream=stream)
         else:
-            return self._generate_general_response(query, agent_data, cross_agent_insights)
+            return self._generate_general_response(query, agent_data, cross_agent_insights, stream=stream)
 
-    def _generate_audit_checklist(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None) -> str:
+    def _generate_audit_checklist(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None, stream: bool = False) -> Union[str, Iterator[str]]:
         """Generate intelligent, risk-based audit checklist"""
         
         # Extract company and audit type from query
@@ -346,19 +440,17 @@ Always maintain professional audit standards, use evidence-based findings, and p
         Generate a professional, comprehensive checklist suitable for a qualified auditor.
         """
         
-        response = self.openai_client.chat.completions.create(
-            model=self.model,
+        return self._complete(
             messages=[
                 {"role": "system", "content": "You are an expert audit checklist creator with deep GMP knowledge."},
                 {"role": "user", "content": checklist_prompt}
             ],
             temperature=0.2,
-            max_tokens=3000
+            max_tokens=3000,
+            stream=stream
         )
-        
-        return response.choices[0].message.content
 
-    def _generate_agenda_analysis(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None) -> str:
+    def _generate_agenda_analysis(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None, stream: bool = False) -> Union[str, Iterator[str]]:
         """Analyze and enhance audit agendas"""
         
         # Extract agenda content from query or context
@@ -387,19 +479,17 @@ Always maintain professional audit standards, use evidence-based findings, and p
         Format as a structured analysis with clear recommendations.
         """
         
-        response = self.openai_client.chat.completions.create(
-            model=self.model,
+        return self._complete(
             messages=[
                 {"role": "system", "content": "You are an expert audit agenda analyst."},
                 {"role": "user", "content": analysis_prompt}
             ],
             temperature=0.2,
-            max_tokens=2500
+            max_tokens=2500,
+            stream=stream
         )
-        
-        return response.choices[0].message.content
 
-    def _generate_delta_analysis(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None) -> str:
+    def _generate_delta_analysis(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None, stream: bool = False) -> Union[str, Iterator[str]]:
         """Generate delta analysis of changes since last audit"""
         
         # Extract time period and company from query
@@ -429,19 +519,17 @@ Always maintain professional audit standards, use evidence-based findings, and p
         Format as a structured delta report with clear impact classifications.
         """
         
-        response = self.openai_client.chat.completions.create(
-            model=self.model,
+        return self._complete(
             messages=[
                 {"role": "system", "content": "You are an expert change management analyst."},
                 {"role": "user", "content": delta_prompt}
             ],
             temperature=0.2,
-            max_tokens=2500
+            max_tokens=2500,
+            stream=stream
         )
-        
-        return response.choices[0].message.content
 
-    def _generate_health_assessment(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None) -> str:
+    def _generate_health_assessment(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None, stream: bool = False) -> Union[str, Iterator[str]]:
         """Generate 360° health assessment for a company/CDMO"""
         
         company_name = self._extract_company_name(query)
@@ -469,19 +557,17 @@ Always maintain professional audit standards, use evidence-based findings, and p
         Provide actionable insights and risk-based recommendations.
         """
         
-        response = self.openai_client.chat.completions.create(
-            model=self.model,
+        return self._complete(
             messages=[
                 {"role": "system", "content": "You are an expert quality systems analyst."},
                 {"role": "user", "content": health_prompt}
             ],
             temperature=0.2,
-            max_tokens=2500
+            max_tokens=2500,
+            stream=stream
         )
-        
-        return response.choices[0].message.content
 
-    def _generate_audit_report(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None) -> str:
+    def _generate_audit_report(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None, stream: bool = False) -> Union[str, Iterator[str]]:
         """Generate structured audit report"""
         
         # Extract audit findings from query or context
@@ -504,19 +590,17 @@ Always maintain professional audit standards, use evidence-based findings, and p
         Ensure professional tone, clear findings classification, and actionable recommendations.
         """
         
-        response = self.openai_client.chat.completions.create(
-            model=self.model,
+        return self._complete(
             messages=[
                 {"role": "system", "content": "You are an expert audit report writer."},
                 {"role": "user", "content": report_prompt}
             ],
             temperature=0.2,
-            max_tokens=3000
+            max_tokens=3000,
+            stream=stream
         )
-        
-        return response.choices[0].message.content
 
-    def _generate_trend_analysis(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None) -> str:
+    def _generate_trend_analysis(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None, stream: bool = False) -> Union[str, Iterator[str]]:
         """Generate trend analysis and insights"""
         
         quality_data = agent_data.get('quality_systems', {}).get('response', '')
@@ -538,19 +622,17 @@ Always maintain professional audit standards, use evidence-based findings, and p
         Focus on actionable insights and risk mitigation strategies.
         """
         
-        response = self.openai_client.chat.completions.create(
-            model=self.model,
+        return self._complete(
             messages=[
                 {"role": "system", "content": "You are an expert trend analyst."},
                 {"role": "user", "content": trend_prompt}
             ],
             temperature=0.2,
-            max_tokens=2000
+            max_tokens=2000,
+            stream=stream
         )
-        
-        return response.choices[0].message.content
 
-    def _generate_general_response(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None) -> str:
+    def _generate_general_response(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None, stream: bool = False) -> Union[str, Iterator[str]]:
         """Generate general audit response"""
         
         # Combine all agent responses
@@ -567,17 +649,15 @@ Always maintain professional audit standards, use evidence-based findings, and p
         Provide a well-structured, professional response that addresses the query with actionable insights.
         """
         
-        response = self.openai_client.chat.completions.create(
-            model=self.model,
+        return self._complete(
             messages=[
                 {"role": "system", "content": "You are an expert audit intelligence analyst."},
                 {"role": "user", "content": general_prompt}
             ],
             temperature=0.3,
-            max_tokens=2000
+            max_tokens=2000,
+            stream=stream
         )
-        
-        return response.choices[0].message.content
 
     # Helper methods for data extraction
     def _extract_company_name(self, query: str) -> str:
@@ -789,7 +869,7 @@ Always maintain professional audit standards, use evidence-based findings, and p
         
         return summary
 
-    def _generate_quality_analysis(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None) -> str:
+    def _generate_quality_analysis(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None, stream: bool = False) -> Union[str, Iterator[str]]:
         """Generate comprehensive quality analysis"""
         quality_data = agent_data.get('quality_systems', {}).get('response', '')
         audit_data = agent_data.get('internal_audit', {}).get('response', '')
@@ -813,19 +893,17 @@ Always maintain professional audit standards, use evidence-based findings, and p
         Ensure comprehensive coverage with specific examples and actionable recommendations.
         """
         
-        response = self.openai_client.chat.completions.create(
-            model=self.model,
+        return self._complete(
             messages=[
                 {"role": "system", "content": "You are an expert quality systems analyst with deep GMP knowledge."},
                 {"role": "user", "content": analysis_prompt}
             ],
             temperature=0.2,
-            max_tokens=2500
+            max_tokens=2500,
+            stream=stream
         )
-        
-        return response.choices[0].message.content
 
-    def _generate_sop_review(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None) -> str:
+    def _generate_sop_review(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None, stream: bool = False) -> Union[str, Iterator[str]]:
         """Generate comprehensive SOP review"""
         sop_data = agent_data.get('sop', {}).get('response', '')
         regulatory_data = agent_data.get('web_scraper', {}).get('response', '')
@@ -849,19 +927,17 @@ Always maintain professional audit standards, use evidence-based findings, and p
         Ensure comprehensive coverage with specific examples and actionable recommendations.
         """
         
-        response = self.openai_client.chat.completions.create(
-            model=self.model,
+        return self._complete(
             messages=[
                 {"role": "system", "content": "You are an expert SOP analyst with deep regulatory knowledge."},
                 {"role": "user", "content": review_prompt}
             ],
             temperature=0.2,
-            max_tokens=2500
+            max_tokens=2500,
+            stream=stream
         )
-        
-        return response.choices[0].message.content
 
-    def _generate_regulatory_research(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None) -> str:
+    def _generate_regulatory_research(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None, stream: bool = False) -> Union[str, Iterator[str]]:
         """Generate comprehensive regulatory research analysis"""
         regulatory_data = agent_data.get('web_scraper', {}).get('response', '')
         sop_data = agent_data.get('sop', {}).get('response', '')
@@ -885,19 +961,17 @@ Always maintain professional audit standards, use evidence-based findings, and p
         Ensure comprehensive coverage with specific regulatory references and actionable recommendations.
         """
         
-        response = self.openai_client.chat.completions.create(
-            model=self.model,
+        return self._complete(
             messages=[
                 {"role": "system", "content": "You are an expert regulatory affairs specialist."},
                 {"role": "user", "content": research_prompt}
             ],
             temperature=0.2,
-            max_tokens=2500
+            max_tokens=2500,
+            stream=stream
         )
-        
-        return response.choices[0].message.content
 
-    def _generate_conference_analysis(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None) -> str:
+    def _generate_conference_analysis(self, query: str, agent_data: Dict[str, Any], cross_agent_insights: Dict[str, Any] = None, stream: bool = False) -> Union[str, Iterator[str]]:
         """Generate comprehensive conference and industry analysis"""
         conference_data = agent_data.get('external_conference', {}).get('response', '')
         quality_data = agent_data.get('quality_systems', {}).get('response', '')
@@ -919,14 +993,12 @@ Always maintain professional audit standards, use evidence-based findings, and p
         Ensure comprehensive coverage with specific examples and actionable recommendations.
         """
         
-        response = self.openai_client.chat.completions.create(
-            model=self.model,
+        return self._complete(
             messages=[
                 {"role": "system", "content": "You are an expert industry analyst with deep pharmaceutical knowledge."},
                 {"role": "user", "content": analysis_prompt}
             ],
             temperature=0.2,
-            max_tokens=2500
-        )
-        
-        return response.choices[0].message.content 
\ No newline at end of file
+            max_tokens=2500,
+            stream=stream
+        ) 
\ No newline at end of file
@@ -179,7 +179,7 @@ Always provide structured, step-by-step guidance based on SOPs and include speci
                 "title": metadata.get('title', 'Unknown'),
                 "file_path": metadata.get('file_path', ''),
                 "score": result['score'],
-                "content_preview": metadata.get('content', '')[:100] + "..."
+                "content_preview": self._preview(metadata.get('content', ''), 100)
             })
         return sources
 
@@ -143,11 +143,13 @@ Always provide specific details from reports, include file references, and highl
         
         for result in search_results:
             metadata = result['metadata']
+            content = metadata.get('content', '')
             source = {
                 'title': metadata.get('title', 'Unknown Document'),
                 'score': result['score'],
                 'agent': self.agent_name,
-                'content': metadata.get('content', '')[:300] + '...' if metadata.get('content') else '',
+                'content': content[:300] + '...' if content else '',
+                'content_preview': self._preview(content, 300),
                 'metadata': {
                     'file_path': metadata.get('file_path', ''),
                     'source_type': 'web_scraper',
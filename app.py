@@ -1,147 +1,158 @@
 import streamlit as st
 import pandas as pd
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional
 import json
+import orjson
+import hashlib
+import html
+import heapq
 from datetime import datetime
 import time
+import importlib
+from pathlib import Path
 
-# Import our custom modules
-from agents.orchestrator_agent import OrchestratorAgent
-from agents.smart_orchestrator_agent import SmartOrchestratorAgent
-from database.vector_db import VectorDatabaseManager
-from database.graph_db import GraphDatabaseManager
-from utils.data_processor import DataProcessor
+# Import our custom modules. Agents, database clients and the document
+# processor pull in openai/pinecone/neo4j/PyPDF2, so they are imported lazily
+# by the resource getters below rather than on every cold start.
 from utils.audit_logger import AuditLogger, RiskLevel, ObservationType
-from utils.checklist_generator import AuditChecklistGenerator
-from config import OUTPUT_TYPES
+from utils.query_cache import QueryCache
+from utils.query_router import determine_intent, get_relevant_agents, agent_mask
+from config import (
+    OUTPUT_TYPES, QUERY_CACHE_CONFIG,
+    AGENT_DISPLAY_NAMES, INTENT_DISPLAY_NAMES, INSIGHT_DISPLAY_NAMES,
+    AGENT_STATUS_ICONS
+)
+
+def display_name(names: Dict[str, str], key: str) -> str:
+    """Look up the UI label for a key, deriving it for keys outside the table"""
+    return names.get(key) or key.replace('_', ' ').title()
+
+# Shared default for missing sequences, so lookups don't allocate a fresh list
+_EMPTY = ()
+
+APP_CSS_PATH = Path(__file__).parent / "static" / "app.css"
+
+@st.cache_resource(show_spinner=False)
+def load_app_css() -> str:
+    """Read the app stylesheet once per process, ready to inject"""
+    return f"<style>\n{APP_CSS_PATH.read_text()}</style>"
+
+def metric_row_html(metrics: List[tuple]) -> str:
+    """Render (label, value) pairs as one row of metric tiles, styled by static/app.css"""
+    tiles = "".join(
+        f'<div class="metric"><span class="metric-label">{html.escape(str(label))}</span>'
+        f'<span class="metric-value">{html.escape(str(value))}</span></div>'
+        for label, value in metrics
+    )
+    return f'<div class="metric-row">{tiles}</div>'
+
+def source_markdown(source: Dict[str, Any]) -> str:
+    """Assemble the markdown body shown in a source's expander"""
+    parts = [
+        f"**Document:** {source.get('title', 'Unknown')}",
+        f"**Agent:** {source.get('agent', 'Unknown')}",
+        f"**Relevance:** {source.get('score', 0):.3f}"
+    ]
+    
+    # Agents attach the truncated preview when they build the source
+    if source.get('content_preview'):
+        parts.append("**Content:**")
+        parts.append(f"*{source['content_preview']}*")
+    
+    if 'metadata' in source:
+        lines = ["**Metadata:**", ""]
+        lines.extend(f"- **{key}:** {value}" for key, value in source['metadata'].items())
+        parts.append("\n".join(lines))
+    
+    return "\n\n".join(parts)
+
+def sources_digest(sources: List[Dict[str, Any]]) -> str:
+    """Content hash of a source list, used as its markdown cache key"""
+    # Sorted keys, so equal sources hash equally whatever order their fields were set in
+    payload = orjson.dumps(sources, default=str, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def build_sources_markdown(digest: str, _sources: List[Dict[str, Any]]) -> List[str]:
+    """Markdown bodies for a source list, cached by its digest so reruns skip rebuilding them"""
+    return [source_markdown(source) for source in _sources]
+
+def load_class(path: str):
+    """Import and return a class given its dotted 'module.ClassName' path"""
+    module_name, _, class_name = path.rpartition('.')
+    return getattr(importlib.import_module(module_name), class_name)
+
+# Heavy components are process-wide singletons: Streamlit re-executes this
+# script on every interaction, so they are built once and shared via
+# st.cache_resource instead of being reconstructed on each rerun.
+@st.cache_resource(show_spinner=False)
+def get_orchestrator():
+    return load_class("agents.orchestrator_agent.OrchestratorAgent")()
+
+@st.cache_resource(show_spinner=False)
+def get_smart_orchestrator():
+    return load_class("agents.smart_orchestrator_agent.SmartOrchestratorAgent")()
+
+@st.cache_resource(show_spinner=False)
+def get_vector_db():
+    return load_class("database.vector_db.VectorDatabaseManager")()
+
+@st.cache_resource(show_spinner=False)
+def get_graph_db():
+    return load_class("database.graph_db.GraphDatabaseManager")()
+
+@st.cache_resource(show_spinner=False)
+def get_data_processor():
+    return load_class("utils.data_processor.DataProcessor")()
+
+@st.cache_resource(show_spinner=False)
+def get_checklist_generator():
+    return load_class("utils.checklist_generator.AuditChecklistGenerator")()
+
+@st.cache_resource(show_spinner=False)
+def get_query_cache() -> QueryCache:
+    return QueryCache(**QUERY_CACHE_CONFIG)
 
 class AuditIntelligenceApp:
-    def __init__(self):
-        # Initialize components only when needed for better performance
-        self._orchestrator = None
-        self._smart_orchestrator = None
-        self._vector_db = None
-        self._graph_db = None
-        self._data_processor = None
-        self._audit_logger = None
-        self._checklist_generator = None
-        
     @property
     def orchestrator(self):
-        if self._orchestrator is None:
-            self._orchestrator = OrchestratorAgent()
-        return self._orchestrator
+        return get_orchestrator()
     
     @property
     def smart_orchestrator(self):
-        if self._smart_orchestrator is None:
-            self._smart_orchestrator = SmartOrchestratorAgent()
-        return self._smart_orchestrator
+        return get_smart_orchestrator()
     
     @property
     def vector_db(self):
-        if self._vector_db is None:
-            self._vector_db = VectorDatabaseManager()
-        return self._vector_db
+        return get_vector_db()
     
     @property
     def graph_db(self):
-        if self._graph_db is None:
-            self._graph_db = GraphDatabaseManager()
-        return self._graph_db
+        return get_graph_db()
     
     @property
     def data_processor(self):
-        if self._data_processor is None:
-            self._data_processor = DataProcessor()
-        return self._data_processor
+        return get_data_processor()
     
     @property
     def audit_logger(self):
-        if self._audit_logger is None:
-            self._audit_logger = AuditLogger()
-        return self._audit_logger
+        # Observations belong to the user's session, so the logger lives in
+        # session state rather than in the process-wide resource cache
+        if 'audit_logger' not in st.session_state:
+            st.session_state.audit_logger = AuditLogger()
+        return st.session_state.audit_logger
     
     @property
     def checklist_generator(self):
-        if self._checklist_generator is None:
-            self._checklist_generator = AuditChecklistGenerator()
-        return self._checklist_generator
+        return get_checklist_generator()
+    
+    @property
+    def query_cache(self):
+        return get_query_cache()
         
     def run(self):
-        st.set_page_config(
-            page_title="AI Audit Intelligence",
-            page_icon="📋",
-            layout="wide",
-            initial_sidebar_state="collapsed"
-        )
-        
         # Custom CSS for better performance and styling
-        st.markdown("""
-        <style>
-        .main-header {
-            font-size: 2.5rem;
-            color: #1f77b4;
-            text-align: center;
-            margin-bottom: 2rem;
-            font-weight: bold;
-        }
-        .agent-status {
-            display: flex;
-            align-items: center;
-            gap: 10px;
-            padding: 8px;
-            border-radius: 5px;
-            margin: 5px 0;
-            background-color: #f8f9fa;
-        }
-        .agent-loading {
-            color: #007bff;
-        }
-        .agent-success {
-            color: #28a745;
-        }
-        .agent-error {
-            color: #dc3545;
-        }
-        .source-item {
-            background-color: #f8f9fa;
-            padding: 10px;
-            border-radius: 5px;
-            margin: 5px 0;
-            border-left: 4px solid #007bff;
-        }
-        .response-container {
-            background-color: #ffffff;
-            border: 1px solid #e0e0e0;
-            border-radius: 8px;
-            padding: 20px;
-            margin: 20px 0;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        .file-upload-area {
-            border: 2px dashed #ccc;
-            border-radius: 10px;
-            padding: 40px;
-            text-align: center;
-            background-color: #fafafa;
-            margin: 20px 0;
-        }
-        .stButton > button {
-            width: 100%;
-            background-color: #007bff;
-            color: white;
-            border: none;
-            padding: 12px 24px;
-            border-radius: 5px;
-            font-size: 16px;
-            font-weight: bold;
-        }
-        .stButton > button:hover {
-            background-color: #0056b3;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+        st.markdown(load_app_css(), unsafe_allow_html=True)
         
         # Initialize session state
         self._initialize_session_state()
@@ -149,8 +160,13 @@ class AuditIntelligenceApp:
         # Header
         st.markdown('<h1 class="main-header">AI Audit Intelligence</h1>', unsafe_allow_html=True)
         
-        # Main content (sidebar removed)
+        # Main content
         self._create_main_content()
+        
+        # Sidebar with agent status and cache statistics, drawn after the main
+        # content so it reflects the query this run just processed
+        with st.sidebar:
+            self._create_sidebar()
     
     def _initialize_session_state(self):
         """Initialize session state variables"""
@@ -163,6 +179,21 @@ class AuditIntelligenceApp:
                 'quality_systems': 'idle',
                 'sop': 'idle'
             }
+            st.session_state.completed_mask = 0
+        
+    def _create_sidebar(self):
+        """Create the sidebar with agent status and query cache statistics"""
+        st.markdown("### 🤖 Agent Status")
+        st.markdown("  \n".join(
+            f"{AGENT_STATUS_ICONS[status]} {display_name(AGENT_DISPLAY_NAMES, agent_name)} Agent"
+            for agent_name, status in st.session_state.agent_status.items()
+        ))
+        
+        stats = self.query_cache.get_cache_stats()
+        
+        st.markdown("### ⚡ Query Cache")
+        st.metric("Hit Rate", f"{stats['hit_rate']:.0%}")
+        st.caption(f"{stats['hits']} hits · {stats['misses']} misses · {stats['size']}/{stats['max_size']} cached")
         
     def _create_main_content(self):
         """Create the main content area"""
@@ -196,7 +227,11 @@ class AuditIntelligenceApp:
             self._create_fine_tune_agents_tab()
     
     def _create_smart_audit_tab(self):
-        """Create the Smart Audit AI tab"""
+        """Create the Smart Audit AI tab.
+        
+        Not a fragment: a query updates agent status and cache statistics,
+        which the sidebar must pick up in the same run.
+        """
         st.markdown("### 🤖 Smart Audit Orchestrator")
         st.markdown("Ask complex audit questions and get intelligent, risk-based responses.")
         
@@ -216,6 +251,7 @@ class AuditIntelligenceApp:
         if submit_button and query.strip():
             self._process_smart_query(query.strip())
     
+    @st.fragment
     def _create_checklist_tab(self):
         """Create the Checklist Generator tab"""
         st.markdown("### 📋 Intelligent Checklist Generator")
@@ -248,6 +284,7 @@ class AuditIntelligenceApp:
             if company_name:
                 self._generate_checklist(company_name, audit_type, product_modality, risk_factors)
     
+    @st.fragment
     def _create_observation_logger_tab(self):
         """Create the Observation Logger tab"""
         st.markdown("### 📝 Audit Observation Logger")
@@ -285,6 +322,7 @@ class AuditIntelligenceApp:
         st.markdown("### Recent Observations")
         self._display_observations()
     
+    @st.fragment
     def _create_audit_reports_tab(self):
         """Create the Audit Reports tab"""
         st.markdown("### 📊 Audit Reports & Analytics")
@@ -309,12 +347,13 @@ class AuditIntelligenceApp:
     def _process_query(self, query: str):
         """Process the user query with intelligent routing"""
         
-        # Reset agent status
-        for agent_name in st.session_state.agent_status:
-            st.session_state.agent_status[agent_name] = 'idle'
+        # Build each status update locally and publish it with one assignment
+        agent_status = dict.fromkeys(st.session_state.agent_status, 'idle')
+        st.session_state.completed_mask = 0
         
-        # Determine intent and route
+        # Determine intent and route; its label is kept so reruns don't reclassify
         intent = self._determine_intent(query)
+        st.session_state.last_intent_display = display_name(INTENT_DISPLAY_NAMES, intent)
         
         # Create progress container
         progress_container = st.container()
@@ -331,10 +370,9 @@ class AuditIntelligenceApp:
             # Initialize agent status
             for i, agent_name in enumerate(agents_to_use):
                 with cols[i]:
-                    st.markdown(f"**{agent_name.replace('_', ' ').title()}**")
-                    status_placeholder = st.empty()
-                    st.session_state.agent_status[agent_name] = 'running'
-                    status_placeholder.markdown("🔄 Running...")
+                    st.markdown(f"**{display_name(AGENT_DISPLAY_NAMES, agent_name)}**\n\n🔄 Running...")
+            agent_status.update(dict.fromkeys(agents_to_use, 'running'))
+            st.session_state.agent_status = agent_status
         
         # Process with orchestrator
         try:
@@ -342,16 +380,15 @@ class AuditIntelligenceApp:
             response = self.orchestrator.process_query(query, intent=intent)
             
             # Update agent status to completed
-            for agent_name in agents_to_use:
-                st.session_state.agent_status[agent_name] = 'completed'
+            st.session_state.agent_status = {**agent_status, **dict.fromkeys(agents_to_use, 'completed')}
+            st.session_state.completed_mask = agent_mask(*agents_to_use)
             
             # Display response
             self._display_response(response, query)
             
         except Exception as e:
             # Update agent status to error
-            for agent_name in agents_to_use:
-                st.session_state.agent_status[agent_name] = 'error'
+            st.session_state.agent_status = {**agent_status, **dict.fromkeys(agents_to_use, 'error')}
             
             st.error(f"An error occurred while processing your query: {str(e)}")
     
@@ -359,31 +396,38 @@ class AuditIntelligenceApp:
         """Process query using the Smart Orchestrator Agent"""
         
         # Reset agent status
-        for agent_name in st.session_state.agent_status:
-            st.session_state.agent_status[agent_name] = 'idle'
+        agent_status = dict.fromkeys(st.session_state.agent_status, 'idle')
+        st.session_state.agent_status = agent_status
+        st.session_state.completed_mask = 0
         
-        # Create progress container
-        progress_container = st.container()
-        
-        with progress_container:
-            st.markdown("### 🧠 Smart Audit AI Analysis")
-            
-            # Show processing status
-            status_placeholder = st.empty()
-            status_placeholder.markdown("🔄 Smart AI is analyzing your query...")
+        st.markdown("### 🧠 Smart Audit AI Analysis")
         
         # Process with smart orchestrator
         try:
-            # Get response from smart orchestrator
-            response = self.smart_orchestrator.process_query(query)
+            # Serve repeated questions from the query cache
+            response = self.query_cache.get(query)
+            response_stream = None
+            if response is None:
+                # Show live processing status while the agents gather data
+                with st.status("🔄 Smart AI is analyzing your query...") as status:
+                    response, response_stream = self.smart_orchestrator.process_query_stream(query)
+                    status.update(label="✅ Agents finished, writing the response", state="complete")
             
             # Update agent status
-            for agent_name in response.get('involved_agents', []):
-                if agent_name in st.session_state.agent_status:
-                    st.session_state.agent_status[agent_name] = 'completed'
+            involved_agents = set(response.get('involved_agents', [])).intersection(agent_status)
+            st.session_state.agent_status = {**agent_status, **dict.fromkeys(involved_agents, 'completed')}
+            st.session_state.completed_mask = agent_mask(*involved_agents)
             
-            # Display smart response
-            self._display_smart_response(response, query)
+            # Display smart response, streaming the analysis as it is generated
+            self._display_smart_response(response, query, response_stream)
+            
+            # Only cache complete answers; a degraded one (an agent timed out
+            # or failed) would otherwise be served to every user for the TTL
+            agents_completed = all(
+                comm.get('status') == 'completed' for comm in response.get('agent_communications', [])
+            )
+            if response_stream is not None and agents_completed:
+                self.query_cache.set(query, response)
             
         except Exception as e:
             st.error(f"An error occurred while processing your query: {str(e)}")
@@ -419,8 +463,11 @@ class AuditIntelligenceApp:
         # Display checklist
         st.markdown(checklist_data['checklist'])
         
-        # Download option
-        checklist_json = json.dumps(checklist_data, indent=2)
+        # Download option (orjson bytes go straight to the download button)
+        checklist_json = orjson.dumps(
+            checklist_data,
+            option=orjson.OPT_INDENT_2
+        )
         st.download_button(
             label="Download Checklist (JSON)",
             data=checklist_json,
@@ -473,12 +520,12 @@ class AuditIntelligenceApp:
             st.metric("Minor", summary['by_risk_level']['Minor'])
         
         # Show recent observations
-        recent_observations = self.audit_logger.observations[-10:]  # Last 10 observations
+        recent_observations = self.audit_logger.observations_frame().tail(10)  # Last 10 observations
         
-        if recent_observations:
-            for obs in reversed(recent_observations):
-                with st.expander(f"{obs.area} - {obs.finding[:50]}..."):
-                    st.markdown(f"**Risk Level:** {obs.risk_level.value} {obs.priority_label}")
+        if not recent_observations.empty:
+            for obs in recent_observations.iloc[::-1].itertuples(index=False):
+                with st.expander(f"{obs.area} - {obs.finding_preview}"):
+                    st.markdown(f"**Risk Level:** {obs.risk_level} {obs.priority_label}")
                     st.markdown(f"**Evidence:** {obs.evidence}")
                     st.markdown(f"**Reference:** {obs.reference}")
                     st.markdown(f"**Status:** {obs.status}")
@@ -495,7 +542,28 @@ class AuditIntelligenceApp:
         if report_type == "Observation Summary":
             report = self.audit_logger.generate_observation_summary(company_filter if company_filter else None)
             st.markdown("### 📊 Observation Summary")
-            st.json(report)
+
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Total Observations", report['total_observations'])
+            with col2:
+                st.metric("Overdue", report['overdue'])
+
+            # Arrow-backed tables instead of the recursive JSON tree renderer
+            col1, col2 = st.columns(2)
+            with col1:
+                st.dataframe(
+                    pd.DataFrame.from_records(list(report['by_risk_level'].items()), columns=['Risk Level', 'Count']),
+                    hide_index=True, use_container_width=True
+                )
+            with col2:
+                st.dataframe(
+                    pd.DataFrame.from_records(list(report['by_status'].items()), columns=['Status', 'Count']),
+                    hide_index=True, use_container_width=True
+                )
+
+            with st.expander("Raw summary"):
+                st.json(report)
         
         elif report_type == "Structured Report":
             report = self.audit_logger.generate_observation_report(
@@ -517,42 +585,43 @@ class AuditIntelligenceApp:
             # This would integrate with the smart orchestrator for delta analysis
             st.info("Delta analysis requires integration with Smart Orchestrator Agent.")
     
-    def _display_smart_response(self, response: Dict[str, Any], query: str):
-        """Display response from Smart Orchestrator Agent with enhanced document citations"""
+    def _display_smart_response(self, response: Dict[str, Any], query: str, response_stream: Optional[Iterator[str]] = None):
+        """Display response from Smart Orchestrator Agent with enhanced document citations.
+        
+        When response_stream is given, the analysis is streamed into the page and the
+        full text is stored back on response['response'].
+        """
         
         st.markdown("---")
         st.markdown("### Smart Audit AI Response")
         
         # Display intent and agent communications
         intent = response.get('intent', 'unknown')
-        st.info(f"**Detected Intent:** {intent.replace('_', ' ').title()}")
+        st.info(f"**Detected Intent:** {display_name(INTENT_DISPLAY_NAMES, intent)}")
         
         # Display agent communications
         agent_communications = response.get('agent_communications', [])
         if agent_communications:
             st.markdown("### Agent Communications")
-            comm_col1, comm_col2, comm_col3 = st.columns(3)
-            
-            with comm_col1:
-                st.metric("Total Agents", len(agent_communications))
-            
-            with comm_col2:
-                successful_agents = len([comm for comm in agent_communications if comm.get('status') == 'completed'])
-                st.metric("Successful", successful_agents)
-            
-            with comm_col3:
-                total_docs = sum(comm.get('documents_found', 0) for comm in agent_communications if comm.get('status') == 'completed')
-                st.metric("Documents Found", total_docs)
+            completed = [comm for comm in agent_communications if comm.get('status') == 'completed']
+            st.markdown(metric_row_html([
+                ("Total Agents", len(agent_communications)),
+                ("Successful", len(completed)),
+                ("Documents Found", sum(comm.get('documents_found', 0) for comm in completed))
+            ]), unsafe_allow_html=True)
             
             # Show agent details
             for comm in agent_communications:
                 if comm.get('status') == 'completed':
-                    st.success(f"✅ {comm['agent'].replace('_', ' ').title()}: {comm.get('documents_found', 0)} documents (Score: {comm.get('relevance_score', 0):.2f})")
+                    st.success(f"✅ {display_name(AGENT_DISPLAY_NAMES, comm['agent'])}: {comm.get('documents_found', 0)} documents (Score: {comm.get('relevance_score', 0):.2f})")
                 else:
-                    st.error(f"❌ {comm['agent'].replace('_', ' ').title()}: {comm.get('error', 'Unknown error')}")
+                    st.error(f"❌ {display_name(AGENT_DISPLAY_NAMES, comm['agent'])}: {comm.get('error', 'Unknown error')}")
         
         # Display main response
-        if 'response' in response:
+        if response_stream is not None:
+            st.markdown("### Analysis Results")
+            response['response'] = st.write_stream(response_stream)
+        elif 'response' in response:
             st.markdown("### Analysis Results")
             st.markdown(response['response'])
         
@@ -562,7 +631,7 @@ class AuditIntelligenceApp:
             st.markdown("### Cross-Agent Insights")
             for insight_type, insight_content in cross_agent_insights.items():
                 if insight_content:
-                    with st.expander(f"{insight_type.replace('_', ' ').title()}"):
+                    with st.expander(display_name(INSIGHT_DISPLAY_NAMES, insight_type)):
                         st.markdown(insight_content)
         
         # Display document citations
@@ -573,27 +642,19 @@ class AuditIntelligenceApp:
             # Show document summary
             document_summary = response.get('document_summary', {})
             if document_summary:
-                doc_col1, doc_col2, doc_col3, doc_col4 = st.columns(4)
-                
-                with doc_col1:
-                    st.metric("Total Documents", document_summary.get('total_documents', 0))
-                
-                with doc_col2:
-                    st.metric("Document Types", len(document_summary.get('document_types', {})))
-                
-                with doc_col3:
-                    st.metric("Agents Used", len(document_summary.get('agents_used', [])))
-                
-                with doc_col4:
-                    high_relevance = len(document_summary.get('high_relevance_documents', []))
-                    st.metric("High Relevance", high_relevance)
+                st.markdown(metric_row_html([
+                    ("Total Documents", document_summary.get('total_documents', 0)),
+                    ("Document Types", len(document_summary.get('document_types', {}))),
+                    ("Agents Used", len(document_summary.get('agents_used', []))),
+                    ("High Relevance", len(document_summary.get('high_relevance_documents', [])))
+                ]), unsafe_allow_html=True)
             
             # Show document breakdown by agent
             document_breakdown = document_summary.get('document_breakdown', {})
             if document_breakdown:
                 st.markdown("#### Documents by Agent")
                 for agent, docs in document_breakdown.items():
-                    with st.expander(f"{agent.replace('_', ' ').title()} ({len(docs)} documents)"):
+                    with st.expander(f"{display_name(AGENT_DISPLAY_NAMES, agent)} ({len(docs)} documents)"):
                         for doc in docs:
                             st.markdown(f"**{doc.get('document_id', 'Unknown')}**: {doc.get('title', 'Unknown')}")
                             st.markdown(f"*File: {doc.get('file_name', 'Unknown')} | Score: {doc.get('relevance_score', 0):.3f}*")
@@ -610,7 +671,9 @@ class AuditIntelligenceApp:
         sources = response.get('sources', [])
         if sources:
             st.markdown("### Detailed Sources")
-            for i, source in enumerate(sources[:10], 1):  # Show top 10 sources
+            # Pinecone already scored each match by cosine similarity; rank on that
+            top_sources = heapq.nlargest(10, sources, key=lambda source: source.get('score', 0))
+            for i, source in enumerate(top_sources, 1):  # Show top 10 sources
                 with st.expander(f"Source {i}: {source.get('title', 'Unknown')} ({source.get('document_id', 'Unknown')})"):
                     st.markdown(f"**Agent:** {source.get('agent', 'Unknown')}")
                     st.markdown(f"**File:** {source.get('metadata', {}).get('file_name', 'Unknown')}")
@@ -619,62 +682,17 @@ class AuditIntelligenceApp:
                     st.markdown(f"**Company:** {source.get('metadata', {}).get('company', 'N/A')}")
                     st.markdown(f"**Date:** {source.get('metadata', {}).get('date', 'N/A')}")
                     
-                    if source.get('content'):
+                    if source.get('content_preview'):
                         st.markdown("**Content Preview:**")
-                        st.markdown(f"*{source['content'][:300]}...*")
+                        st.markdown(f"*{source['content_preview']}*")
     
     def _determine_intent(self, query: str) -> str:
         """Determine the user's intent from the query"""
-        query_lower = query.lower()
-        
-        # Check for checklist intent
-        if any(word in query_lower for word in ['checklist', 'list', 'steps', 'procedures']):
-            return 'checklist'
-        
-        # Check for report intent
-        if any(word in query_lower for word in ['report', 'analysis', 'summary', 'overview']):
-            return 'report'
-        
-        # Check for insights intent
-        if any(word in query_lower for word in ['insights', 'trends', 'patterns', 'analysis']):
-            return 'insights'
-        
-        # Default to general
-        return 'general'
+        return determine_intent(query)
     
     def _get_relevant_agents(self, query: str, intent: str) -> List[str]:
         """Determine which agents are relevant for the query"""
-        query_lower = query.lower()
-        relevant_agents = []
-        
-        # Always include orchestrator
-        relevant_agents.append('orchestrator')
-        
-        # Check for company-specific queries
-        if any(word in query_lower for word in ['hovione', 'boehringer', 'thermo fisher', 'company']):
-            relevant_agents.extend(['quality_systems', 'external_conference'])
-        
-        # Check for audit-related queries
-        if any(word in query_lower for word in ['audit', 'compliance', 'checklist']):
-            relevant_agents.extend(['internal_audit', 'sop'])
-        
-        # Check for quality-related queries
-        if any(word in query_lower for word in ['quality', 'snc', 'deviation']):
-            relevant_agents.append('quality_systems')
-        
-        # Check for conference-related queries
-        if any(word in query_lower for word in ['conference', 'event', 'meeting']):
-            relevant_agents.append('external_conference')
-        
-        # Check for web scraping related queries
-        if any(word in query_lower for word in ['fda', 'warning', 'due diligence']):
-            relevant_agents.append('web_scraper')
-        
-        # If no specific agents identified, use all
-        if len(relevant_agents) <= 1:
-            relevant_agents = ['web_scraper', 'internal_audit', 'external_conference', 'quality_systems', 'sop']
-        
-        return relevant_agents
+        return get_relevant_agents(query)
     
     def _display_response(self, response: Dict, query: str):
         """Display the response with proper formatting and source attribution"""
@@ -682,50 +700,42 @@ class AuditIntelligenceApp:
         st.markdown("---")
         st.markdown("### 📋 Response")
         
+        sources = response.get('sources', _EMPTY)
+        
         # Create response container
-        with st.container():
-            st.markdown('<div class="response-container">', unsafe_allow_html=True)
-            
+        with st.container(border=True):
             # Display main response
             if 'response' in response:
                 st.markdown(response['response'])
             
             # Display sources with better formatting
-            if 'sources' in response and response['sources']:
+            if sources:
                 st.markdown("---")
                 st.markdown("### 📚 Sources")
                 
-                for i, source in enumerate(response['sources'], 1):
-                    with st.expander(f"Source {i}: {source.get('title', 'Unknown Document')}"):
-                        st.markdown(f"**Document:** {source.get('title', 'Unknown')}")
-                        st.markdown(f"**Agent:** {source.get('agent', 'Unknown')}")
-                        st.markdown(f"**Relevance:** {source.get('score', 0):.3f}")
-                        
-                        if 'content' in source:
-                            st.markdown("**Content:**")
-                            st.markdown(f"*{source['content'][:300]}...*")
-                        
-                        if 'metadata' in source:
-                            st.markdown("**Metadata:**")
-                            for key, value in source['metadata'].items():
-                                st.markdown(f"- **{key}:** {value}")
-            
-            st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Display processing summary
+                source_bodies = build_sources_markdown(sources_digest(sources), sources)
+                
+                # Each source stays collapsed until opened
+                for i, (source, body) in enumerate(zip(sources, source_bodies), 1):
+                    with st.expander(f"Source {i}: {source.get('title', 'Unknown Document')}", expanded=False):
+                        st.markdown(body)
+        
+        # Display processing summary; nothing to summarise without sources
+        if sources:
+            self._render_processing_summary(len(sources))
+    
+    @st.fragment
+    def _render_processing_summary(self, source_count: int):
+        """Render the processing summary metrics, rerunning independently of the page"""
         st.markdown("---")
         st.markdown("### ⚡ Processing Summary")
         
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric("Query Type", self._determine_intent(query).title())
-        
-        with col2:
-            st.metric("Agents Used", len([s for s in st.session_state.agent_status.values() if s == 'completed']))
-        
-        with col3:
-            st.metric("Sources Found", len(response.get('sources', [])))
+        # One element for the whole row instead of three columns of st.metric
+        st.markdown(metric_row_html([
+            ("Query Type", st.session_state.last_intent_display),
+            ("Agents Used", bin(st.session_state.completed_mask).count("1")),
+            ("Sources Found", source_count)
+        ]), unsafe_allow_html=True)
 
     def _create_knowledge_base_management_tab(self):
         """Create the Knowledge Base Management tab"""
@@ -736,11 +746,11 @@ class AuditIntelligenceApp:
         agent_name = st.selectbox(
             "Select Agent",
             ["web_scraper", "internal_audit", "external_conference", "quality_systems", "sop"],
-            format_func=lambda x: x.replace("_", " ").title()
+            format_func=AGENT_DISPLAY_NAMES.get
         )
         
         # Display current documents for selected agent
-        st.markdown(f"#### Current Documents for {agent_name.replace('_', ' ').title()}")
+        st.markdown(f"#### Current Documents for {AGENT_DISPLAY_NAMES[agent_name]}")
         
         try:
             # Get documents from vector database
@@ -845,7 +855,7 @@ class AuditIntelligenceApp:
         agent_name = st.selectbox(
             "Select Agent to Fine Tune",
             ["web_scraper", "internal_audit", "external_conference", "quality_systems", "sop"],
-            format_func=lambda x: x.replace("_", " ").title()
+            format_func=AGENT_DISPLAY_NAMES.get
         )
         
         # Get current system prompt
@@ -901,6 +911,7 @@ class AuditIntelligenceApp:
         """Delete a document from an agent's knowledge base"""
         try:
             self.vector_db.delete_document(agent_name, doc_id)
+            self.query_cache.invalidate()
             return True
         except Exception as e:
             st.error(f"Error deleting document: {str(e)}")
@@ -927,6 +938,8 @@ class AuditIntelligenceApp:
                 documents_processed = self.data_processor._process_file_with_chunking(temp_path, agent_name, self.vector_db)
             
             if documents_processed > 0:
+                # Cached answers may no longer reflect the knowledge base
+                self.query_cache.invalidate()
                 return True
             else:
                 st.error("No content could be extracted from the document")
@@ -978,6 +991,16 @@ class AuditIntelligenceApp:
             return "Default system prompt not available."
 
 def main():
+    st.set_page_config(
+        page_title="AI Audit Intelligence",
+        page_icon="📋",
+        layout="wide",
+        initial_sidebar_state="collapsed"
+    )
+    
+    # Built per rerun: the object is a thin shell over the cached resource
+    # getters, and caching an instance of a class defined in the main script
+    # would keep serving stale methods after the script is edited
     app = AuditIntelligenceApp()
     app.run()
 
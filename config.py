@@ -41,7 +41,9 @@ AGENT_CONFIGS = {
     "smart_orchestrator": {
         "model": "gpt-4o-mini",
         "temperature": 0.2,
-        "max_tokens": 3000
+        "max_tokens": 3000,
+        "max_workers": 4,  # parallel sub-agent queries
+        "agent_timeout": 60  # seconds to wait for all sub-agents
     },
     "web_scraper": {
         "model": "gpt-4o-mini", 
@@ -85,4 +87,48 @@ OUTPUT_TYPES = {
     "checklist": "Create a checklist or questionnaire", 
     "insights": "Provide insights and analysis",
     "general": "Answer general questions"
-} 
\ No newline at end of file
+}
+
+# Smart query response cache
+QUERY_CACHE_CONFIG = {
+    "max_size": 128,
+    "ttl": 3600  # seconds
+}
+
+# Query embedding cache held by each VectorDatabaseManager
+EMBEDDING_CACHE_CONFIG = {
+    "encoding": "float32",  # or "int8": ~4x smaller but lossy (per-vector scaled)
+    "max_size": 1024
+}
+
+# UI display names, precomputed once instead of formatting on every render
+AGENT_DISPLAY_NAMES = {
+    agent_name: agent_name.replace('_', ' ').title()
+    for agent_name in ('orchestrator', *PINECONE_INDEXES)
+}
+
+INTENT_DISPLAY_NAMES = {
+    intent: intent.replace('_', ' ').title()
+    for intent in (
+        *OUTPUT_TYPES,
+        'audit_checklist', 'audit_agenda', 'audit_report', 'delta_analysis',
+        'health_assessment', 'trend_analysis', 'supplier_audit', 'internal_audit',
+        'regulatory_audit', 'quality_analysis', 'sop_review', 'regulatory_research',
+        'conference_analysis', 'general_audit'
+    )
+}
+
+INSIGHT_DISPLAY_NAMES = {
+    insight_type: insight_type.replace('_', ' ').title()
+    for insight_type in (
+        'quality_audit_correlation', 'regulatory_compliance_gaps', 'sop_quality_alignment',
+        'trend_cross_validation', 'risk_factor_identification'
+    )
+}
+
+AGENT_STATUS_ICONS = {
+    'idle': '⭕',
+    'running': '🔄',
+    'completed': '✅',
+    'error': '❌'
+}
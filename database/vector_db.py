@@ -1,15 +1,31 @@
 from pinecone import Pinecone, ServerlessSpec
 from openai import OpenAI
 from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import uuid
 import hashlib
-from config import PINECONE_API_KEY, OPENAI_API_KEY, PINECONE_INDEXES, PINECONE_NAMESPACES
+import numpy as np
+from config import PINECONE_API_KEY, OPENAI_API_KEY, PINECONE_INDEXES, PINECONE_NAMESPACES, EMBEDDING_CACHE_CONFIG
+
+EMBEDDING_ENCODINGS = ("float32", "int8")
+# Index queries in a batch are network-bound, so they run on a small thread pool
+BATCH_SEARCH_WORKERS = 8
 
 class VectorDatabaseManager:
-    def __init__(self):
+    def __init__(self, encoding: str = EMBEDDING_CACHE_CONFIG["encoding"],
+                 embedding_cache_size: int = EMBEDDING_CACHE_CONFIG["max_size"]):
+        if encoding not in EMBEDDING_ENCODINGS:
+            raise ValueError(f"Unknown embedding encoding: {encoding}")
+        
         self.pc = Pinecone(api_key=PINECONE_API_KEY)
         self.openai_client = OpenAI(api_key=OPENAI_API_KEY)
         self.indexes = {}
+        self.encoding = encoding
+        self.embedding_cache_size = embedding_cache_size
+        self._embedding_cache = OrderedDict()
+        self._embedding_cache_lock = threading.Lock()
         self._initialize_indexes()
         
     def _initialize_indexes(self):
@@ -45,6 +61,59 @@ class VectorDatabaseManager:
             model="text-embedding-3-small"
         )
         return response.data[0].embedding
+    
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Get embeddings for several texts in a single OpenAI request"""
+        response = self.openai_client.embeddings.create(
+            input=[text.replace("\n", " ") for text in texts],
+            model="text-embedding-3-small"
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+    
+    def _encode_embedding(self, embedding: List[float]):
+        """Encode an embedding for the query cache"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        if self.encoding == "float32":
+            return vector, None
+        
+        # Symmetric per-vector scaling onto the int8 range
+        scale = float(np.abs(vector).max()) / 127.0 or 1.0
+        return np.round(vector / scale).astype(np.int8), scale
+    
+    def _decode_embedding(self, encoded) -> List[float]:
+        """Decode a cached embedding back to floats"""
+        vector, scale = encoded
+        if scale is None:
+            return vector.tolist()
+        return (vector.astype(np.float32) * scale).tolist()
+    
+    def get_query_embeddings(self, queries: List[str]) -> List[List[float]]:
+        """Get query embeddings, serving repeats from the LRU query cache"""
+        keys = [hashlib.md5(query.encode('utf-8')).hexdigest() for query in queries]
+        embeddings = {}
+        
+        with self._embedding_cache_lock:
+            for key in keys:
+                if key in self._embedding_cache:
+                    self._embedding_cache.move_to_end(key)
+                    embeddings[key] = self._decode_embedding(self._embedding_cache[key])
+        
+        missing = list(dict.fromkeys(
+            (key, query) for key, query in zip(keys, queries) if key not in embeddings
+        ))
+        if missing:
+            fetched = self.get_embeddings([query for _, query in missing])
+            with self._embedding_cache_lock:
+                for (key, _), embedding in zip(missing, fetched):
+                    # Serve the cached form on a miss too, so a query always searches with the same vector
+                    encoded = self._encode_embedding(embedding)
+                    embeddings[key] = self._decode_embedding(encoded)
+                    self._embedding_cache[key] = encoded
+                    self._embedding_cache.move_to_end(key)
+                while len(self._embedding_cache) > self.embedding_cache_size:
+                    self._embedding_cache.popitem(last=False)
+        
+        return [embeddings[key] for key in keys]
         
     def upsert_document(self, agent_name: str, text: str, metadata: Dict[str, Any]):
         """Upsert a document into the specified agent's index with namespace"""
@@ -83,8 +152,12 @@ class VectorDatabaseManager:
         if agent_name not in self.indexes:
             raise ValueError(f"Unknown agent: {agent_name}")
             
-        query_embedding = self.get_embedding(query)
-        
+        query_embedding = self.get_query_embeddings([query])[0]
+        return self._query_index(agent_name, query_embedding, top_k, filter_dict)
+    
+    def _query_index(self, agent_name: str, query_embedding: List[float], top_k: int,
+                     filter_dict: Dict = None) -> List[Dict]:
+        """Query an agent's index with a precomputed embedding"""
         # Get namespace for this agent
         namespace = PINECONE_NAMESPACES.get(agent_name, agent_name)
         
@@ -100,35 +173,63 @@ class VectorDatabaseManager:
             
         results = self.indexes[agent_name].query(**search_kwargs)
         return results['matches']
+    
+    def batch_search(self, searches: List[Dict[str, Any]], top_k: int = 5) -> List[List[Dict]]:
+        """Run several searches, embedding every distinct query text in one request.
+        
+        Each search is a dict with 'agent_name', 'query' and an optional metadata
+        'filter'. The index queries run concurrently; results are returned in the
+        same order as the searches.
+        """
+        for search in searches:
+            if search['agent_name'] not in self.indexes:
+                raise ValueError(f"Unknown agent: {search['agent_name']}")
+        
+        unique_queries = list(dict.fromkeys(search['query'] for search in searches))
+        if not unique_queries:
+            return []
+        embeddings = dict(zip(unique_queries, self.get_query_embeddings(unique_queries)))
+        
+        def run_search(search: Dict[str, Any]) -> List[Dict]:
+            return self._query_index(search['agent_name'], embeddings[search['query']], top_k, search.get('filter'))
+        
+        if len(searches) == 1:
+            return [run_search(searches[0])]
+        with ThreadPoolExecutor(max_workers=min(BATCH_SEARCH_WORKERS, len(searches))) as executor:
+            return list(executor.map(run_search, searches))
         
     def search_across_all_agents(self, query: str, top_k_per_agent: int = 3) -> Dict[str, List[Dict]]:
         """Search across all agent indexes"""
-        results = {}
+        agent_names = list(self.indexes.keys())
+        batch_results = self.batch_search(
+            [{"agent_name": agent_name, "query": query} for agent_name in agent_names],
+            top_k_per_agent
+        )
         
-        for agent_name in self.indexes.keys():
-            agent_results = self.search_documents(agent_name, query, top_k_per_agent)
-            if agent_results:
-                results[agent_name] = agent_results
-                
-        return results
+        return {
+            agent_name: agent_results
+            for agent_name, agent_results in zip(agent_names, batch_results)
+            if agent_results
+        }
         
     def search_by_company(self, company_name: str, top_k_per_agent: int = 5) -> Dict[str, List[Dict]]:
         """Search for documents mentioning a specific company across all agents"""
-        results = {}
-        
-        for agent_name in self.indexes.keys():
-            # Search with company name filter
-            agent_results = self.search_documents(
-                agent_name, 
-                company_name, 
-                top_k_per_agent,
-                filter_dict={"company": {"$in": [company_name]}}
-            )
-            
-            if agent_results:
-                results[agent_name] = agent_results
-                
-        return results
+        agent_names = list(self.indexes.keys())
+        
+        # Search with company name filter
+        batch_results = self.batch_search(
+            [
+                {"agent_name": agent_name, "query": company_name, "filter": {"company": {"$in": [company_name]}}}
+                for agent_name in agent_names
+            ],
+            top_k_per_agent
+        )
+        
+        return {
+            agent_name: agent_results
+            for agent_name, agent_results in zip(agent_names, batch_results)
+            if agent_results
+        }
         
     def search_by_date_range(self, agent_name: str, start_date: str, end_date: str, 
                            query: str = "", top_k: int = 10) -> List[Dict]:
@@ -201,12 +302,16 @@ class VectorDatabaseManager:
         if agent_names is None:
             agent_names = list(self.indexes.keys())
             
-        all_results = {}
-        for agent_name in agent_names:
-            if agent_name in self.indexes:
-                results = self.search_documents(agent_name, query, top_k_per_agent)
-                if results:
-                    all_results[agent_name] = results
+        agent_names = [agent_name for agent_name in agent_names if agent_name in self.indexes]
+        batch_results = self.batch_search(
+            [{"agent_name": agent_name, "query": query} for agent_name in agent_names],
+            top_k_per_agent
+        )
+        all_results = {
+            agent_name: results
+            for agent_name, results in zip(agent_names, batch_results)
+            if results
+        }
                     
         # Format context
         context_parts = []
@@ -25,7 +25,8 @@ def check_dependencies():
     required_packages = [
         'streamlit', 'pandas', 'numpy', 'openai', 'pinecone',
         'python-dotenv', 'psycopg2-binary', 'sqlalchemy', 'langchain',
-        'neo4j', 'pypdf2', 'beautifulsoup4', 'requests', 'python-dateutil'
+        'neo4j', 'pypdf2', 'beautifulsoup4', 'requests', 'python-dateutil',
+        'orjson'
     ]
     
     missing_packages = []
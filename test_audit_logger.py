@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Test script for the audit logger's columnar observation store
+Checks column growth, company/status interning, rebuild on load, read-only observations
+and that summaries match counts taken over the observation list
+"""
+
+import os
+import sys
+import random
+import tempfile
+from dataclasses import FrozenInstanceError
+from datetime import datetime, timedelta
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.audit_logger import AuditLogger, ObservationColumns, RiskLevel, ObservationType, SUMMARY_STATUSES
+
+def add_observation(logger, company="Hovione", risk_level=RiskLevel.MINOR, due_date=None, finding="Finding"):
+    """Create an observation with placeholder values for the fields under test"""
+    return logger.create_observation(
+        area="Sterile Manufacturing",
+        finding=finding,
+        risk_level=risk_level,
+        evidence="Batch record",
+        reference="21 CFR 211",
+        observation_type=ObservationType.DOCUMENT_REVIEW,
+        auditor="Auditor",
+        company=company,
+        audit_type="GMP",
+        due_date=due_date
+    )
+
+def list_summary(observations, company=None):
+    """Count risk levels, statuses and overdue items with plain loops over the observation list"""
+    if company:
+        observations = [obs for obs in observations if obs.company.lower() == company.lower()]
+    now = datetime.now()
+    by_risk_level = {level.value: 0 for level in RiskLevel}
+    by_status = {status: 0 for status in SUMMARY_STATUSES}
+    overdue = 0
+    for obs in observations:
+        by_risk_level[obs.risk_level.value] += 1
+        if obs.status in by_status:
+            by_status[obs.status] += 1
+        if obs.due_date and obs.due_date < now and obs.status == "Open":
+            overdue += 1
+    return {
+        "total_observations": len(observations),
+        "by_risk_level": by_risk_level,
+        "by_status": by_status,
+        "overdue": overdue
+    }
+
+def test_growth():
+    """Test that the columns grow past their initial capacity"""
+    print("Column Growth Test")
+    print("=" * 50)
+
+    logger = AuditLogger()
+    for i in range(150):
+        add_observation(logger, finding=f"Finding {i}")
+
+    frame = logger.observations_frame()
+    assert logger._columns.size == 150
+    assert len(logger._columns.risk_level) >= 150
+    assert len(frame) == 150
+    assert list(frame["finding"]) == [f"Finding {i}" for i in range(150)]
+    assert list(frame["id"]) == [obs.id for obs in logger.observations]
+    print(f"✅ 150 rows stored, capacity {len(logger._columns.risk_level)}")
+
+def test_interning():
+    """Test that companies intern case-insensitively and new statuses get their own id"""
+    print("\nInterning Test")
+    print("=" * 50)
+
+    columns = ObservationColumns()
+    assert columns.status_ids == {status: code for code, status in enumerate(SUMMARY_STATUSES)}
+
+    logger = AuditLogger()
+    first = add_observation(logger, company="Hovione")
+    add_observation(logger, company="HOVIONE")
+    add_observation(logger, company="Boehringer")
+    columns = logger._columns
+    assert columns.company_ids == {"hovione": 0, "boehringer": 1}
+    assert [obs.company for obs in logger.get_observations_by_company("hovione")] == ["Hovione", "HOVIONE"]
+    assert logger.get_observations_by_company("Unknown") == []
+    print(f"✅ companies: {columns.company_ids}")
+
+    logger.update_observation_status(first.id, "Pending")
+    assert columns.status_ids["Pending"] == len(SUMMARY_STATUSES)
+    assert logger.observations_frame()["status"].iloc[0] == "Pending"
+    assert sum(logger.generate_observation_summary()["by_status"].values()) == 2
+    print(f"✅ statuses: {columns.status_ids}")
+
+def test_load_rebuild():
+    """Test that loading observations rebuilds the columns"""
+    print("\nLoad Rebuild Test")
+    print("=" * 50)
+
+    logger = AuditLogger()
+    for i in range(70):
+        obs = add_observation(logger, company=random.choice(["Hovione", "Boehringer"]),
+                              due_date=datetime.now() - timedelta(days=1) if i % 3 else None)
+        if i % 5 == 0:
+            logger.update_observation_status(obs.id, "Closed")
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = logger.save_observations(os.path.join(directory, "observations.json"))
+        loaded = AuditLogger()
+        add_observation(loaded, company="Stale")
+        assert loaded.load_observations(filename)
+
+    assert loaded._columns.size == 70
+    assert "stale" not in loaded._columns.company_ids
+    assert list(loaded.observations_frame()["id"]) == list(logger.observations_frame()["id"])
+    for company in (None, "Hovione", "Boehringer"):
+        assert loaded.generate_observation_summary(company) == logger.generate_observation_summary(company)
+    print("✅ columns, frame and summaries rebuilt from the saved file")
+
+def test_read_only_observations():
+    """Test that observations can only change through the logger"""
+    print("\nRead-only Observations Test")
+    print("=" * 50)
+
+    logger = AuditLogger()
+    obs = add_observation(logger, due_date=datetime.now() - timedelta(days=1))
+    assert logger.generate_observation_summary()["overdue"] == 1
+
+    try:
+        obs.status = "Closed"
+        raise AssertionError("observation accepted a direct status change")
+    except FrozenInstanceError:
+        pass
+    assert isinstance(logger.observations, tuple)
+    print("✅ direct changes rejected")
+
+    due_date = datetime.now() + timedelta(days=30)
+    assert logger.add_corrective_action(obs.id, "Retrain staff", due_date)
+    updated = logger.observations[0]
+    assert updated.corrective_action == "Retrain staff" and updated.due_date == due_date
+    assert updated.finding_preview == obs.finding_preview
+    assert logger.generate_observation_summary()["overdue"] == 0
+    assert logger.observations_frame()["corrective_action"].iloc[0] == "Retrain staff"
+
+    assert logger.update_observation_status(obs.id, "Closed")
+    assert logger.observations[0].status == "Closed"
+    assert logger.generate_observation_summary() == list_summary(logger.observations)
+    assert not logger.update_observation_status("missing", "Closed")
+    print("✅ updates reach the observation list, columns and summary")
+
+def test_summary_matches_list_counts():
+    """Test that column summaries match list-based counts over random observations"""
+    print("\nSummary Equality Test")
+    print("=" * 50)
+
+    rng = random.Random(1234)
+    companies = ["Hovione", "hovione", "Boehringer", "Thermo Fisher"]
+    statuses = ["Open", "Closed", "In Progress", "Pending"]
+
+    for trial in range(20):
+        logger = AuditLogger()
+        for _ in range(rng.randint(0, 200)):
+            due_date = rng.choice([None, datetime.now() - timedelta(days=rng.randint(1, 90)),
+                                   datetime.now() + timedelta(days=rng.randint(1, 90))])
+            obs = add_observation(logger, company=rng.choice(companies),
+                                  risk_level=rng.choice(list(RiskLevel)), due_date=due_date)
+            if rng.random() < 0.4:
+                logger.update_observation_status(obs.id, rng.choice(statuses))
+            if rng.random() < 0.2:
+                logger.add_corrective_action(obs.id, "Action", datetime.now() - timedelta(days=rng.randint(-30, 30)))
+
+        for company in (None, "Hovione", "BOEHRINGER", "Thermo Fisher", "Unknown"):
+            expected = list_summary(logger.observations, company)
+            assert logger.generate_observation_summary(company) == expected, (trial, company)
+    print("✅ 20 random logs summarised identically")
+
+def main():
+    """Run all audit logger tests"""
+    print("Audit Logger Test")
+    print("=" * 70)
+
+    test_growth()
+    test_interning()
+    test_load_rebuild()
+    test_read_only_observations()
+    test_summary_matches_list_counts()
+
+    print("\n" + "=" * 70)
+    print("Audit Logger Test Completed!")
+
+if __name__ == "__main__":
+    main()
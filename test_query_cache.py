@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for the smart orchestrator query cache
+Checks query normalization, TTL expiry, LRU eviction, invalidation and hit/miss statistics
+"""
+
+import os
+import sys
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.query_cache import QueryCache
+
+def test_normalization():
+    """Test that case and whitespace variations share one entry"""
+    print("Query Normalization Test")
+    print("=" * 50)
+
+    cache = QueryCache(max_size=4, ttl=60)
+    cache.set("  What changed at   Hovione? ", "answer")
+
+    assert cache.get("what changed at hovione?") == "answer"
+    assert cache.get("WHAT CHANGED AT HOVIONE?") == "answer"
+    assert cache.get("what changed at boehringer?") is None
+    assert cache.get("what changed at hovione?", intent="report") is None
+    print("✅ variants share an entry; other queries and intents do not")
+
+def test_ttl_expiry():
+    """Test that entries expire after the TTL"""
+    print("\nTTL Expiry Test")
+    print("=" * 50)
+
+    cache = QueryCache(max_size=4, ttl=10)
+    with mock.patch("utils.query_cache.time.time", return_value=1000.0):
+        cache.set("query", "answer")
+    with mock.patch("utils.query_cache.time.time", return_value=1009.0):
+        assert cache.get("query") == "answer"
+    with mock.patch("utils.query_cache.time.time", return_value=1010.0):
+        assert cache.get("query") is None
+    assert cache.get_cache_stats()["size"] == 0
+    print("✅ entry served before the TTL and dropped once it expires")
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted when full"""
+    print("\nLRU Eviction Test")
+    print("=" * 50)
+
+    cache = QueryCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # 'b' is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.get_cache_stats()["size"] == 2
+    print("✅ least recently used entry evicted")
+
+def test_invalidate():
+    """Test that invalidate drops every entry"""
+    print("\nInvalidate Test")
+    print("=" * 50)
+
+    cache = QueryCache(max_size=4, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.invalidate()
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get_cache_stats()["size"] == 0
+    print("✅ all entries dropped")
+
+def test_stats():
+    """Test hit/miss accounting"""
+    print("\nCache Statistics Test")
+    print("=" * 50)
+
+    cache = QueryCache(max_size=8, ttl=60)
+    assert cache.get_cache_stats()["hit_rate"] == 0.0
+
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("missing")
+    stats = cache.get_cache_stats()
+
+    assert stats == {"size": 1, "max_size": 8, "hits": 2, "misses": 1, "hit_rate": 2 / 3}, stats
+    print(f"✅ {stats}")
+
+def main():
+    """Run all query cache tests"""
+    print("Query Cache Test")
+    print("=" * 70)
+
+    test_normalization()
+    test_ttl_expiry()
+    test_lru_eviction()
+    test_invalidate()
+    test_stats()
+
+    print("\n" + "=" * 70)
+    print("Query Cache Test Completed!")
+
+if __name__ == "__main__":
+    main()
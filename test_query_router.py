@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for the keyword-based query router
+Checks that the Aho-Corasick and regex fallback matchers agree and that intents and agents are routed as expected
+"""
+
+import os
+import sys
+from collections import Counter
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils import query_router
+from utils.query_router import KeywordMatcher, determine_intent, get_relevant_agents
+
+def build_matchers(keywords):
+    """Build the same matcher with the automaton (when installed) and with the regex fallback"""
+    matchers = {}
+    if query_router.ahocorasick is not None:
+        matchers["automaton"] = KeywordMatcher(keywords)
+
+    automaton_module = query_router.ahocorasick
+    query_router.ahocorasick = None
+    try:
+        matchers["regex"] = KeywordMatcher(keywords)
+    finally:
+        query_router.ahocorasick = automaton_module
+    return matchers
+
+def test_keyword_matcher_overlaps():
+    """Test that both matcher paths report overlapping and nested keywords"""
+    print("Keyword Matcher Overlap Test")
+    print("=" * 50)
+
+    test_cases = [
+        {
+            "keywords": {"checklist": "checklist", "list": "list"},
+            "text": "audit checklist",
+            "expected": ["checklist", "list"]
+        },
+        {
+            "keywords": {"event": "event", "events": "events"},
+            "text": "upcoming events",
+            "expected": ["event", "events"]
+        },
+        {
+            "keywords": {"due diligence": "dd", "due": "due"},
+            "text": "due diligence is due",
+            "expected": ["due diligence", "due", "due"]
+        },
+        {
+            "keywords": {"fda": "fda"},
+            "text": "nothing relevant here",
+            "expected": []
+        }
+    ]
+
+    for case in test_cases:
+        for name, matcher in build_matchers(case["keywords"]).items():
+            found = Counter(matcher.iter_keywords(case["text"]))
+            assert found == Counter(case["expected"]), f"{name} matcher on {case['text']!r}: {dict(found)}"
+            print(f"✅ {name}: {case['text']!r} -> {sorted(found.elements())}")
+
+def test_matchers_agree_on_routing_keywords():
+    """Test that both matcher paths agree on the production routing keyword tables"""
+    print("\nRouting Keyword Agreement Test")
+    print("=" * 50)
+
+    queries = [
+        "Generate a checklist for Hovione sterile manufacturing audit",
+        "Recent FDA warning letters and due diligence for Thermo Fisher",
+        "Quality deviations and SNC trends at Boehringer",
+        "Summary of conference events and meetings",
+        "hello"
+    ]
+
+    for table in (query_router.INTENT_KEYWORDS, query_router.KEYWORD_TO_BITMASK):
+        matchers = build_matchers(table)
+        for query in queries:
+            results = {name: Counter(matcher.iter_keywords(query.lower())) for name, matcher in matchers.items()}
+            assert results["regex"] == results.get("automaton", results["regex"]), f"{query!r}: {results}"
+    print(f"✅ {len(queries)} queries matched identically")
+
+def test_determine_intent_priority():
+    """Test intent priority: checklist beats report beats insights"""
+    print("\nIntent Priority Test")
+    print("=" * 50)
+
+    test_cases = [
+        ("Give me a checklist", "checklist"),
+        ("Report the steps for the audit", "checklist"),
+        ("Trends analysis", "report"),
+        ("What patterns and insights emerged?", "insights"),
+        ("Hello there", "general")
+    ]
+
+    for query, expected_intent in test_cases:
+        intent = determine_intent(query)
+        assert intent == expected_intent, f"{query!r}: expected {expected_intent}, got {intent}"
+        print(f"✅ {query!r} -> {intent}")
+
+def test_relevant_agents():
+    """Test that agents come back once each, in routing order"""
+    print("\nRelevant Agents Test")
+    print("=" * 50)
+
+    agents = get_relevant_agents("FDA warning letters for Thermo Fisher quality events")
+    assert agents == ["orchestrator", "web_scraper", "external_conference", "quality_systems"], agents
+    print(f"✅ {agents}")
+
+    agents = get_relevant_agents("hello")
+    assert agents == query_router.AGENT_ORDER, agents
+    print(f"✅ no keywords -> {agents}")
+
+def main():
+    """Run all query router tests"""
+    print("Query Router Test")
+    print("=" * 70)
+    print(f"pyahocorasick installed: {query_router.ahocorasick is not None}")
+    print()
+
+    test_keyword_matcher_overlaps()
+    test_matchers_agree_on_routing_keywords()
+    test_determine_intent_priority()
+    test_relevant_agents()
+
+    print("\n" + "=" * 70)
+    print("Query Router Test Completed!")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import json
 import uuid
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field, replace
 from enum import Enum
+import numpy as np
+import pandas as pd
+from utils.text_utils import preview_text
 
 class RiskLevel(Enum):
     CRITICAL = "Critical"
@@ -17,9 +20,13 @@ class ObservationType(Enum):
     SYSTEM_REVIEW = "System Review"
     FACILITY_TOUR = "Facility Tour"
 
-@dataclass
+@dataclass(frozen=True)
 class AuditObservation:
-    """Structured audit observation entry"""
+    """Structured audit observation entry.
+    
+    Frozen so the columnar mirror in AuditLogger cannot drift; changes go
+    through AuditLogger, which swaps in an updated copy.
+    """
     id: str
     area: str
     finding: str
@@ -36,14 +43,18 @@ class AuditObservation:
     due_date: Optional[datetime] = None
     status: str = "Open"
     attachments: List[str] = None
+    # Short finding shown in list views, derived once instead of on every render
+    finding_preview: str = field(init=False, repr=False)
     
     def __post_init__(self):
         if self.attachments is None:
-            self.attachments = []
+            object.__setattr__(self, 'attachments', [])
+        object.__setattr__(self, 'finding_preview', preview_text(self.finding, 50))
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for storage"""
         data = asdict(self)
+        del data['finding_preview']
         data['risk_level'] = self.risk_level.value
         data['observation_type'] = self.observation_type.value
         data['timestamp'] = self.timestamp.isoformat()
@@ -61,12 +72,148 @@ class AuditObservation:
             data['due_date'] = datetime.fromisoformat(data['due_date'])
         return cls(**data)
 
+# Integer codes for the risk levels, in RiskLevel declaration order
+RISK_LEVEL_CODES = {level: code for code, level in enumerate(RiskLevel)}
+RISK_LEVEL_VALUES = np.array([level.value for level in RiskLevel], dtype=object)
+SUMMARY_STATUSES = ("Open", "Closed", "In Progress")
+
+class ObservationColumns:
+    """Structure-of-arrays store of the observation fields used for filtering, display and aggregation.
+    
+    Row i describes observations[i]. Companies (case-insensitive) and statuses
+    are interned to integer ids so filters and summaries are array operations.
+    """
+    
+    COLUMN_DTYPES = {
+        'id': object,
+        'area': object,
+        'finding': object,
+        'finding_preview': object,
+        'evidence': object,
+        'reference': object,
+        'priority_label': object,
+        'corrective_action': object,
+        'risk_level': np.int8,
+        'status': np.int32,
+        'company_id': np.int32,
+        'timestamp': 'datetime64[us]',
+        'due_date': 'datetime64[us]'
+    }
+    
+    def __init__(self, capacity: int = 64):
+        self.size = 0
+        for name, dtype in self.COLUMN_DTYPES.items():
+            setattr(self, name, np.empty(capacity, dtype=dtype))
+        self.company_ids: Dict[str, int] = {}
+        self.status_ids: Dict[str, int] = {status: code for code, status in enumerate(SUMMARY_STATUSES)}
+    
+    def _grow(self):
+        """Double the capacity of every column"""
+        capacity = max(2 * len(self.risk_level), 1)
+        for name in self.COLUMN_DTYPES:
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+    
+    def _intern(self, table: Dict[str, int], value: str) -> int:
+        """Get the integer id for a value, assigning the next id if it is new"""
+        return table.setdefault(value, len(table))
+    
+    def append(self, obs: 'AuditObservation'):
+        """Append the fields of an observation"""
+        if self.size == len(self.risk_level):
+            self._grow()
+        
+        row = self.size
+        for name in ('id', 'area', 'finding', 'finding_preview', 'evidence', 'reference', 'priority_label', 'corrective_action'):
+            getattr(self, name)[row] = getattr(obs, name)
+        self.risk_level[row] = RISK_LEVEL_CODES[obs.risk_level]
+        self.company_id[row] = self._intern(self.company_ids, obs.company.lower())
+        self.timestamp[row] = np.datetime64(obs.timestamp, 'us')
+        self.size += 1
+        self.set_status(row, obs.status)
+        self.set_due_date(row, obs.due_date)
+    
+    def set_status(self, row: int, status: str):
+        """Update the status code of a row"""
+        self.status[row] = self._intern(self.status_ids, status)
+    
+    def set_due_date(self, row: int, due_date: Optional[datetime]):
+        """Update the due date of a row (NaT when unset)"""
+        self.due_date[row] = np.datetime64(due_date, 'us') if due_date else np.datetime64('NaT')
+    
+    def set_corrective_action(self, row: int, action: Optional[str]):
+        """Update the corrective action of a row"""
+        self.corrective_action[row] = action
+    
+    def company_rows(self, company: str) -> np.ndarray:
+        """Get the row indices of a company's observations (case-insensitive)"""
+        company_code = self.company_ids.get(company.lower())
+        if company_code is None:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(self.company_id[:self.size] == company_code)
+    
+    def to_frame(self) -> pd.DataFrame:
+        """Build a DataFrame over the filled rows, decoding risk levels and statuses"""
+        status_values = np.array(list(self.status_ids), dtype=object)
+        return pd.DataFrame({
+            'id': self.id[:self.size],
+            'area': self.area[:self.size],
+            'finding': self.finding[:self.size],
+            'finding_preview': self.finding_preview[:self.size],
+            'risk_level': RISK_LEVEL_VALUES[self.risk_level[:self.size]],
+            'priority_label': self.priority_label[:self.size],
+            'evidence': self.evidence[:self.size],
+            'reference': self.reference[:self.size],
+            'status': status_values[self.status[:self.size]],
+            'timestamp': self.timestamp[:self.size],
+            'due_date': self.due_date[:self.size],
+            # Kept as object so a missing action stays None rather than NaN
+            'corrective_action': pd.Series(self.corrective_action[:self.size], dtype=object)
+        })
+    
+    def summarize(self, company: str = None) -> Dict[str, Any]:
+        """Aggregate risk-level, status and overdue counts, optionally for one company"""
+        company_code = self.company_ids.get(company.lower(), -1) if company else None
+        return _summarize_codes(
+            self.risk_level[:self.size],
+            self.status[:self.size],
+            self.company_id[:self.size],
+            self.due_date[:self.size],
+            company_code,
+            self.status_ids["Open"]
+        )
+
+def _summarize_codes(risk_level: np.ndarray, status: np.ndarray, company_id: np.ndarray,
+                     due_date: np.ndarray, company_code: Optional[int], open_code: int) -> Dict[str, Any]:
+    """Count observations per risk level and status over raw code arrays"""
+    if company_code is not None:
+        mask = company_id == company_code
+        risk_level, status, due_date = risk_level[mask], status[mask], due_date[mask]
+    
+    risk_counts = np.bincount(risk_level, minlength=len(RiskLevel))
+    status_counts = np.bincount(status, minlength=len(SUMMARY_STATUSES))
+    overdue = (due_date < np.datetime64(datetime.now(), 'us')) & (status == open_code)
+    
+    return {
+        "total_observations": int(len(risk_level)),
+        "by_risk_level": {level.value: int(risk_counts[code]) for level, code in RISK_LEVEL_CODES.items()},
+        "by_status": {status_name: int(status_counts[code]) for code, status_name in enumerate(SUMMARY_STATUSES)},
+        "overdue": int(overdue.sum())
+    }
+
 class AuditLogger:
     """Comprehensive audit logging system"""
     
     def __init__(self, storage_path: str = "audit_logs"):
         self.storage_path = storage_path
-        self.observations: List[AuditObservation] = []
+        self._observations: List[AuditObservation] = []
+        self._frame: Optional[pd.DataFrame] = None
+        self._columns = ObservationColumns()
+        # Bumped on every change; summaries are memoised per (company, version)
+        self._version = 0
+        self._summary_cache: Dict[tuple, Dict[str, Any]] = {}
         self.priority_labels = {
             "critical": "🔥 Priority",
             "major": "🔥 Priority", 
@@ -105,75 +252,84 @@ class AuditLogger:
             due_date=due_date
         )
         
-        self.observations.append(observation)
+        self._observations.append(observation)
+        self._columns.append(observation)
+        self._invalidate()
         return observation
     
+    @property
+    def observations(self) -> Tuple[AuditObservation, ...]:
+        """Read-only view of the observations; use the update methods to change them"""
+        return tuple(self._observations)
+    
+    def _invalidate(self):
+        """Drop derived views after observations change"""
+        self._version += 1
+        self._frame = None
+        self._summary_cache.clear()
+    
+    def observations_frame(self) -> pd.DataFrame:
+        """Get a cached DataFrame view of the observations, one row per observation"""
+        if self._frame is None:
+            self._frame = self._columns.to_frame()
+        return self._frame
+    
     def get_observations_by_company(self, company: str) -> List[AuditObservation]:
         """Get all observations for a specific company"""
-        return [obs for obs in self.observations if obs.company.lower() == company.lower()]
+        return [self._observations[row] for row in self._columns.company_rows(company)]
     
     def get_observations_by_risk_level(self, risk_level: RiskLevel) -> List[AuditObservation]:
         """Get observations by risk level"""
-        return [obs for obs in self.observations if obs.risk_level == risk_level]
+        return [obs for obs in self._observations if obs.risk_level == risk_level]
     
     def get_observations_by_area(self, area: str) -> List[AuditObservation]:
         """Get observations by area"""
-        return [obs for obs in self.observations if area.lower() in obs.area.lower()]
+        return [obs for obs in self._observations if area.lower() in obs.area.lower()]
     
     def get_open_observations(self) -> List[AuditObservation]:
         """Get all open observations"""
-        return [obs for obs in self.observations if obs.status == "Open"]
+        return [obs for obs in self._observations if obs.status == "Open"]
     
     def get_overdue_observations(self) -> List[AuditObservation]:
         """Get overdue observations"""
         now = datetime.now()
-        return [obs for obs in self.observations 
+        return [obs for obs in self._observations 
                 if obs.due_date and obs.due_date < now and obs.status == "Open"]
     
     def update_observation_status(self, observation_id: str, status: str) -> bool:
         """Update observation status"""
-        for obs in self.observations:
+        for row, obs in enumerate(self._observations):
             if obs.id == observation_id:
-                obs.status = status
+                self._observations[row] = replace(obs, status=status)
+                self._columns.set_status(row, status)
+                self._invalidate()
                 return True
         return False
     
     def add_corrective_action(self, observation_id: str, action: str, due_date: Optional[datetime] = None) -> bool:
         """Add or update corrective action for an observation"""
-        for obs in self.observations:
+        for row, obs in enumerate(self._observations):
             if obs.id == observation_id:
-                obs.corrective_action = action
+                self._observations[row] = replace(obs, corrective_action=action, due_date=due_date or obs.due_date)
+                self._columns.set_corrective_action(row, action)
                 if due_date:
-                    obs.due_date = due_date
+                    self._columns.set_due_date(row, due_date)
+                self._invalidate()
                 return True
         return False
     
     def generate_observation_summary(self, company: str = None) -> Dict[str, Any]:
-        """Generate summary statistics for observations"""
-        observations = self.observations
-        if company:
-            observations = self.get_observations_by_company(company)
-        
-        summary = {
-            "total_observations": len(observations),
-            "by_risk_level": {
-                "Critical": len([obs for obs in observations if obs.risk_level == RiskLevel.CRITICAL]),
-                "Major": len([obs for obs in observations if obs.risk_level == RiskLevel.MAJOR]),
-                "Minor": len([obs for obs in observations if obs.risk_level == RiskLevel.MINOR])
-            },
-            "by_status": {
-                "Open": len([obs for obs in observations if obs.status == "Open"]),
-                "Closed": len([obs for obs in observations if obs.status == "Closed"]),
-                "In Progress": len([obs for obs in observations if obs.status == "In Progress"])
-            },
-            "overdue": len(self.get_overdue_observations()) if not company else len([obs for obs in observations if obs.due_date and obs.due_date < datetime.now() and obs.status == "Open"])
-        }
-        
+        """Generate summary statistics for observations, memoised until they change"""
+        key = (company, self._version)
+        summary = self._summary_cache.get(key)
+        if summary is None:
+            summary = self._columns.summarize(company)
+            self._summary_cache[key] = summary
         return summary
     
     def generate_observation_report(self, company: str = None, format_type: str = "structured") -> str:
         """Generate a formatted observation report"""
-        observations = self.observations
+        observations = self._observations
         if company:
             observations = self.get_observations_by_company(company)
         
@@ -308,11 +464,11 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
     def export_observations(self, format_type: str = "json") -> str:
         """Export observations to different formats"""
         if format_type == "json":
-            return json.dumps([obs.to_dict() for obs in self.observations], indent=2)
+            return json.dumps([obs.to_dict() for obs in self._observations], indent=2)
         elif format_type == "csv":
             return self._export_to_csv()
         else:
-            return json.dumps([obs.to_dict() for obs in self.observations], indent=2)
+            return json.dumps([obs.to_dict() for obs in self._observations], indent=2)
     
     def _export_to_csv(self) -> str:
         """Export observations to CSV format"""
@@ -330,7 +486,7 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         ])
         
         # Write data
-        for obs in self.observations:
+        for obs in self._observations:
             writer.writerow([
                 obs.id, obs.company, obs.audit_type, obs.area, obs.finding,
                 obs.risk_level.value, obs.evidence, obs.reference,
@@ -347,7 +503,7 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             filename = f"audit_observations_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
         with open(filename, 'w') as f:
-            json.dump([obs.to_dict() for obs in self.observations], f, indent=2)
+            json.dump([obs.to_dict() for obs in self._observations], f, indent=2)
         
         return filename
     
@@ -357,7 +513,11 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             with open(filename, 'r') as f:
                 data = json.load(f)
             
-            self.observations = [AuditObservation.from_dict(obs_data) for obs_data in data]
+            self._observations = [AuditObservation.from_dict(obs_data) for obs_data in data]
+            self._columns = ObservationColumns(capacity=max(len(self._observations), 64))
+            for obs in self._observations:
+                self._columns.append(obs)
+            self._invalidate()
             return True
         except Exception as e:
             print(f"Error loading observations: {e}")
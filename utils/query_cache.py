@@ -0,0 +1,72 @@
+from typing import Dict, Any, Optional
+from collections import OrderedDict
+import hashlib
+import threading
+import time
+
+class QueryCache:
+    """Thread-safe TTL + LRU cache for orchestrator responses"""
+
+    def __init__(self, max_size: int = 128, ttl: float = 3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Lowercase, strip and collapse whitespace so trivial variations share an entry"""
+        return " ".join(query.lower().split())
+
+    def make_key(self, query: str, intent: Optional[str] = None) -> str:
+        """Build the cache key for a query and optional intent"""
+        normalized = self.normalize_query(query)
+        if intent:
+            normalized = f"{intent}:{normalized}"
+        return hashlib.blake2b(normalized.encode('utf-8')).hexdigest()
+
+    def get(self, query: str, intent: Optional[str] = None) -> Optional[Any]:
+        """Return the cached value for a query, or None on a miss"""
+        key = self.make_key(query, intent)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['expires_at'] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry['value']
+
+    def set(self, query: str, value: Any, intent: Optional[str] = None):
+        """Store a value for a query, evicting the least recently used entry when full"""
+        key = self.make_key(query, intent)
+        with self._lock:
+            self._entries[key] = {
+                'value': value,
+                'expires_at': time.time() + self.ttl
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        """Drop all cached entries, e.g. after the knowledge bases change"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics for the cache"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0
+            }
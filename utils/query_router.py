@@ -0,0 +1,105 @@
+from typing import Dict, List, Any, Iterator, Set
+from functools import lru_cache
+import re
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+class KeywordMatcher:
+    """Find every occurrence of a fixed keyword set in a single pass over the text.
+
+    Uses a pyahocorasick automaton when available and falls back to one
+    compiled regex otherwise. Both report overlapping substring matches, so
+    'checklist' yields both 'checklist' and 'list'.
+    """
+
+    def __init__(self, keywords: Dict[str, Any]):
+        self.keywords = {keyword.lower(): value for keyword, value in keywords.items()}
+
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+        else:
+            self._automaton = None
+            # Longest alternative first, so each position reports its longest
+            # keyword; shorter keywords starting there are its prefixes
+            alternation = '|'.join(re.escape(keyword) for keyword in sorted(self.keywords, key=len, reverse=True))
+            self._pattern = re.compile(f'(?=({alternation}))')
+            self._prefixes = {
+                keyword: [other for other in self.keywords if keyword.startswith(other)]
+                for keyword in self.keywords
+            }
+
+    def iter_keywords(self, text: str) -> Iterator[str]:
+        """Yield each keyword occurrence found in the (already lowercased) text"""
+        if self._automaton is not None:
+            for _, keyword in self._automaton.iter(text):
+                yield keyword
+        else:
+            for match in self._pattern.finditer(text):
+                yield from self._prefixes[match.group(1)]
+
+    def match_values(self, text: str) -> Set[Any]:
+        """Return the set of values whose keywords occur in the text"""
+        return {self.keywords[keyword] for keyword in self.iter_keywords(text)}
+
+# Intent keywords, checked in priority order: checklist, report, insights.
+# 'analysis' belongs to both report and insights; report wins.
+INTENT_KEYWORDS = {
+    'checklist': 'checklist', 'list': 'checklist', 'steps': 'checklist', 'procedures': 'checklist',
+    'report': 'report', 'analysis': 'report', 'summary': 'report', 'overview': 'report',
+    'insights': 'insights', 'trends': 'insights', 'patterns': 'insights'
+}
+INTENT_PRIORITY = ['checklist', 'report', 'insights']
+INTENT_MATCHER = KeywordMatcher(INTENT_KEYWORDS)
+
+# Agents in routing order; bit i of a routing mask selects AGENT_ORDER[i].
+# The orchestrator takes the next bit so status masks can include it too.
+AGENT_ORDER = ['web_scraper', 'internal_audit', 'external_conference', 'quality_systems', 'sop']
+AGENT_BITS = {agent_name: 1 << bit for bit, agent_name in enumerate(AGENT_ORDER)}
+AGENT_BITS['orchestrator'] = 1 << len(AGENT_ORDER)
+
+def agent_mask(*agent_names: str) -> int:
+    """Combine agents into a routing bitmask"""
+    mask = 0
+    for agent_name in agent_names:
+        mask |= AGENT_BITS[agent_name]
+    return mask
+
+# Trigger keyword -> bitmask of the agents it pulls in
+KEYWORD_TO_BITMASK = {
+    **dict.fromkeys(['hovione', 'boehringer', 'thermo fisher', 'company'], agent_mask('quality_systems', 'external_conference')),
+    **dict.fromkeys(['audit', 'compliance', 'checklist'], agent_mask('internal_audit', 'sop')),
+    **dict.fromkeys(['quality', 'snc', 'deviation'], agent_mask('quality_systems')),
+    **dict.fromkeys(['conference', 'event', 'meeting'], agent_mask('external_conference')),
+    **dict.fromkeys(['fda', 'warning', 'due diligence'], agent_mask('web_scraper'))
+}
+AGENT_MATCHER = KeywordMatcher(KEYWORD_TO_BITMASK)
+
+@lru_cache(maxsize=256)
+def determine_intent(query: str) -> str:
+    """Determine the user's intent from the query, memoised per query string"""
+    matched = INTENT_MATCHER.match_values(query.lower())
+    for intent in INTENT_PRIORITY:
+        if intent in matched:
+            return intent
+
+    # Default to general
+    return 'general'
+
+def get_relevant_agents(query: str) -> List[str]:
+    """Determine which agents are relevant for the query"""
+    mask = 0
+    for keyword in AGENT_MATCHER.iter_keywords(query.lower()):
+        mask |= KEYWORD_TO_BITMASK[keyword]
+
+    # If no specific agents identified, use all
+    if not mask:
+        return list(AGENT_ORDER)
+
+    # Always include orchestrator
+    return ['orchestrator'] + [agent_name for bit, agent_name in enumerate(AGENT_ORDER) if mask >> bit & 1]
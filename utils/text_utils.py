@@ -0,0 +1,3 @@
+def preview_text(text: str, limit: int) -> str:
+    """Shorten text for display, adding an ellipsis only when it was cut"""
+    return text[:limit] + "..." if len(text) > limit else text